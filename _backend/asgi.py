@@ -11,6 +11,8 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', '_backend.settings')
+# local by default, like manage.py; production ASGI servers set
+# DJANGO_SETTINGS_MODULE=_backend.settings.production
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "_backend.settings.local")
 
 application = get_asgi_application()
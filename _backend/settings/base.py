@@ -1,5 +1,6 @@
 import os
 from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -31,6 +32,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "api.compression.CompressionMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -38,6 +40,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "api.db_routers.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "_backend.urls"
@@ -63,6 +66,21 @@ WSGI_APPLICATION = "_backend.wsgi.app"
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
+# The first hasher is used for new passwords; older hashes are upgraded
+# transparently the next time the user logs in. Argon2 needs argon2-cffi,
+# otherwise scrypt (stdlib) is preferred over the CPU-heavy PBKDF2.
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+if find_spec("argon2"):
+    PASSWORD_HASHERS.insert(0, "django.contrib.auth.hashers.Argon2PasswordHasher")
+# concurrent password hashes per process on request threads
+PASSWORD_HASHING_WORKERS = int(
+    os.getenv("PASSWORD_HASHING_WORKERS", os.cpu_count() or 1)
+)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -116,26 +134,52 @@ EMAIL_HOST_PASSWORD = os.getenv("EMAIL_PASS")
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# CACHES:
+# "shared" is seen by every worker (throttle counters, a front for token
+# revocation cutoffs stored on the user).
+# Redis when REDIS_URL is set (required in production, see production.py).
+# Otherwise, for local development only, the database cache table (run
+# `manage.py createcachetable`): its incr is a read then a write, and every
+# throttled request writes to it.
+if os.getenv("REDIS_URL"):
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL"),
+    }
+else:
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "shared_cache",
+        # entries past this are culled, so it holds nothing that must survive
+        "OPTIONS": {"MAX_ENTRIES": 10000, "CULL_FREQUENCY": 4},
+    }
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "shared": SHARED_CACHE,
+}
+
 # REST FRAMEWORK Settings:
 REST_FRAMEWORK = {
     # only json exchange data
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "api.renderers.FastJSONRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
         "rest_framework.parsers.JSONParser",
     ],
     # Default to authenticated users
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "app.user.authentication.CachedJWTAuthentication",
     ),
     # Default to authenticated users
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.AllowAny",),
     # limit req
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
-        "rest_framework.throttling.ScopedRateThrottle",
+        "api.throttling.SharedAnonRateThrottle",
+        "api.throttling.SharedUserRateThrottle",
+        "api.throttling.SharedScopedRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "20/minute",
@@ -159,6 +203,67 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
     "TOKEN_TYPE_CLAIM": "token_type",
-    "TOKEN_USER_CLASS": "rest_framework_simplejwt.models.TokenUser",
+    "TOKEN_USER_CLASS": "app.user.authentication.CachedTokenUser",
     "JTI_CLAIM": "jti",
 }
+# seconds a resolved User row stays cached for token-authenticated requests
+AUTH_USER_CACHE_TIMEOUT = 60
+# seconds between full rebuilds of the in-memory refresh token blacklist filter
+TOKEN_BLACKLIST_BLOOM_REBUILD = 300
+# seconds of blacklist rows each sync of that filter reads again, for rows
+# committed out of order or written by a server whose clock is behind
+TOKEN_BLACKLIST_SYNC_GRACE = 60
+# how long a password reset link stays valid
+PASSWORD_RESET_TOKEN_LIFETIME = timedelta(minutes=30)
+# causes with more followers than this get one pulled feed entry instead of
+# one pushed entry per follower
+FEED_PUSH_LIMIT = 1000
+# pub/sub used for the live campaign stream; CacheBroker fans out across
+# workers through the shared cache
+LIVE_EVENTS_BROKER = "app.event.live.InProcessBroker"
+# seconds between SSE keepalive comments on an idle stream
+LIVE_EVENTS_KEEPALIVE = 15
+# database aliases that ReplicaReadMixin views read from; empty reads from default
+DATABASE_REPLICAS = []
+DATABASE_ROUTERS = ["api.db_routers.ReplicaRouter"]
+# seconds a user's reads stay on the primary after they wrote (replica lag)
+DATABASE_STICKY_SECONDS = 5
+# UUID version for new event ids: 7 is time-ordered (see api/ids.py), 4 random
+EVENT_ID_VERSION = 7
+# ids reserved per process at a time from each api.IdSequence row
+ID_BLOCK_SIZE = 100
+# seconds a warm-cached list response is served as fresh, then how much longer
+# it may be served stale while a background rebuild runs (api/warmup.py)
+WARM_CACHE_TIMEOUT = 600
+WARM_CACHE_STALE = 3600
+# campaign list pages rebuilt after each invalidation and by warm_caches
+WARM_CACHE_PAGES = 3
+# build list responses of the busiest endpoints from values() rows instead of
+# model instances (api/fastpath.py); False uses the DRF serializers
+FAST_LIST_SERIALIZERS = True
+# Content-Encoding levels per compressed content type (api/compression.py);
+# streamed exports trade ratio for speed. Unlisted types -- certificate PDFs,
+# images, the event stream -- are sent uncompressed.
+COMPRESSION_LEVELS = {
+    "application/json": {"br": 5, "gzip": 6},
+    "text/html": {"br": 5, "gzip": 6},
+    "application/x-ndjson": {"br": 4, "gzip": 4},
+    "text/csv": {"br": 4, "gzip": 4},
+}
+# bodies smaller than this many bytes are not worth compressing
+COMPRESSION_MIN_SIZE = 1024
+# seconds between adding each process's response sizes to the shared cache
+COMPRESSION_METRICS_FLUSH = 60
+# average bytes sent per response above which response_sizes flags a view
+RESPONSE_SIZE_BUDGET = 64 * 1024
+# ?days= window of the contribution stats endpoints (app/event/stats.py), and
+# seconds each window's response is cached
+STATS_DEFAULT_DAYS = 30
+STATS_MAX_DAYS = 366
+STATS_CACHE_TIMEOUT = 300
+# seconds the known skill and cause ids that profile edits are checked against
+# stay cached; edits to those tables drop them at once (app/user/profiles.py)
+KNOWN_IDS_TIMEOUT = 3600
+# users per bulk provisioning request, hashed on the request thread pool;
+# larger imports go through `manage.py import_users`
+BULK_PROVISION_MAX_ROWS = 500
@@ -6,5 +6,17 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # cache warm-up threads write alongside requests; take the write lock
+        # up front instead of failing with "database is locked" on upgrade
+        "OPTIONS": {"transaction_mode": "IMMEDIATE"},
     }
 }
+# Set replica_db to a second SQLite file (copied from db.sqlite3 or migrated
+# with --database replica) to try replica routing locally
+if os.getenv("replica_db"):
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / os.getenv("replica_db"),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS = ["replica"]
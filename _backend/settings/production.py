@@ -1,3 +1,5 @@
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import *
 
 ALLOWED_HOSTS = [
@@ -26,6 +28,25 @@ CSRF_TRUSTED_ORIGINS = [
     "https://hands-on-volunteering-platform-or66d8a4v.vercel.app",  # Vercel frontend (production)
     "https://handson-social.netlify.app",
 ]
+# Connection reuse: by default each worker keeps its connection for
+# DB_CONN_MAX_AGE seconds instead of reconnecting (and redoing TLS) per
+# request. DB_POOL=1 uses psycopg 3's built-in pool instead; Django does not
+# allow both. Serverless runtimes (Vercel, Lambda) serve one request at a
+# time per instance, so there a pool only holds idle connections; they keep
+# one persistent connection across warm invocations instead.
+SERVERLESS = bool(os.getenv("VERCEL") or os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
+DB_POOL = (
+    not SERVERLESS
+    and os.getenv("DB_POOL") == "1"
+    and find_spec("psycopg_pool") is not None
+)
+DB_OPTIONS = {}
+if DB_POOL:
+    DB_OPTIONS["pool"] = {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        "timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+    }
 DATABASES = {
     "default": {
         "ENGINE": os.getenv("engine"),
@@ -34,17 +55,47 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASS"),
         "HOST": os.getenv("host"),
         "PORT": os.getenv("port"),
+        "CONN_MAX_AGE": (
+            0
+            if DB_POOL
+            else int(os.getenv("DB_CONN_MAX_AGE", "600" if SERVERLESS else "60"))
+        ),
+        # a reused connection may have been dropped while the instance was idle
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": DB_OPTIONS,
     }
 }
+# Behind PgBouncer (or a provider pooler) in transaction mode, server-side
+# cursors cannot outlive a transaction, so .iterator() must fetch client-side.
+DISABLE_SERVER_SIDE_CURSORS = os.getenv("DB_PGBOUNCER") == "1"
+# Read replicas: comma-separated hosts sharing the primary's credentials
+DATABASE_REPLICAS = []
+for number, replica_host in enumerate(
+    filter(None, os.getenv("replica_hosts", "").split(",")), start=1
+):
+    DATABASES[f"replica{number}"] = {
+        **DATABASES["default"],
+        "HOST": replica_host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica{number}")
 
 # CACHES:
+# Throttle counters need an atomic incr shared by every worker, and the live
+# event broker polls the shared cache: only Redis does both without a
+# database write per request.
+if not os.getenv("REDIS_URL"):
+    raise ImproperlyConfigured("REDIS_URL must be set: production needs Redis")
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",  # In-memory cache
         "LOCATION": "unique-snowflake",
-    }
+    },
+    "shared": SHARED_CACHE,
 }
 
+LIVE_EVENTS_BROKER = "app.event.live.CacheBroker"
+
 # Secure settings for production
 SECURE_SSL_REDIRECT = True
 SESSION_COOKIE_SECURE = True
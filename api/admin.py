@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from .models import IdSequence, ScheduledJob, SchedulerLease
+
+
+class ScheduledJobAdmin(admin.ModelAdmin):
+    list_display = [
+        "name",
+        "cron",
+        "enabled",
+        "next_run_at",
+        "last_run_at",
+        "last_status",
+    ]
+    readonly_fields = ["last_run_at", "last_status", "last_error", "last_duration"]
+
+
+admin.site.register(ScheduledJob, ScheduledJobAdmin)
+admin.site.register(SchedulerLease)
+admin.site.register(IdSequence)
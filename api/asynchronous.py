@@ -0,0 +1,145 @@
+"""
+Async-native read-only views for ASGI deployments.
+
+Rows are fetched with the async ORM, so a worker keeps serving other
+requests while waiting on the database or a slow client. Serializers that
+only touch prefetched data run inline; the ones that issue their own
+queries (``serialize_in_thread``) run in a worker thread.
+
+Like the DRF views they mirror, they run the configured throttles first and
+honour ``?fields=``/``?expand=`` (api/fieldsets.py).
+"""
+
+import math
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.http import Http404, JsonResponse
+from django.views import View
+from rest_framework.exceptions import APIException, Throttled
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from api.fieldsets import ALL_FIELDS, FieldSelection
+
+
+class AsyncReadView(View):
+    http_method_names = ["get", "head", "options"]
+    serializer_class = None
+    serialize_in_thread = False
+    # set to paginate like PageNumberPagination ({"count", "next", ...})
+    page_size = None
+    max_page_size = 100
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+
+    async def dispatch(self, request, *args, **kwargs):
+        # authenticators resolve request.user for the per-user throttles
+        self.api_request = Request(
+            request,
+            authenticators=[
+                auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+            ],
+        )
+        try:
+            await sync_to_async(self.initial)(self.api_request)
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            return self.render_error(exc)
+
+    def initial(self, request):
+        # as APIView.initial: reject bad credentials, then throttle
+        request.user
+        self.check_throttles(request)
+
+    def check_throttles(self, request):
+        waits = []
+        for throttle_class in self.throttle_classes:
+            throttle = throttle_class()
+            if not throttle.allow_request(request, self):
+                waits.append(throttle.wait())
+        if waits:
+            raise Throttled(max((w for w in waits if w is not None), default=None))
+
+    def render_error(self, exc):
+        # the body DRF's exception handler would return
+        data = exc.detail
+        if not isinstance(data, (list, dict)):
+            data = {"detail": data}
+        response = JsonResponse(data, status=exc.status_code, safe=False)
+        if isinstance(exc, Throttled) and exc.wait is not None:
+            response["Retry-After"] = str(math.ceil(exc.wait))
+        return response
+
+    def get_field_selection(self):
+        return FieldSelection.from_request(self.api_request) or ALL_FIELDS
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    async def filter_queryset(self, queryset):
+        return queryset
+
+    async def serialize(self, data, many):
+        context = {"field_selection": self.get_field_selection()}
+
+        def run():
+            return self.serializer_class(data, many=many, context=context).data
+
+        if self.serialize_in_thread:
+            return await sync_to_async(run)()
+        return run()
+
+    def render(self, data):
+        return JsonResponse(data, safe=False, encoder=encoders.JSONEncoder)
+
+
+class AsyncListView(AsyncReadView):
+    async def get(self, request, *args, **kwargs):
+        queryset = await self.filter_queryset(self.get_queryset())
+        if self.page_size is None:
+            objects = [obj async for obj in queryset]
+            return self.render(await self.serialize(objects, many=True))
+        return self.render(await self.paginate(request, queryset))
+
+    async def paginate(self, request, queryset):
+        try:
+            page = max(int(request.GET.get("page", 1)), 1)
+            page_size = min(
+                int(request.GET.get("page_size", self.page_size)), self.max_page_size
+            )
+        except ValueError:
+            page, page_size = 1, self.page_size
+        count = await queryset.acount()
+        offset = (page - 1) * page_size
+        objects = [obj async for obj in queryset[offset : offset + page_size]]
+        url = request.build_absolute_uri()
+        previous = None
+        if page == 2:
+            previous = remove_query_param(url, "page")
+        elif page > 2:
+            previous = replace_query_param(url, "page", page - 1)
+        return {
+            "count": count,
+            "next": (
+                replace_query_param(url, "page", page + 1)
+                if offset + page_size < count
+                else None
+            ),
+            "previous": previous,
+            "results": await self.serialize(objects, many=True),
+        }
+
+
+class AsyncRetrieveView(AsyncReadView):
+    lookup_field = "pk"
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            instance = await self.get_queryset().aget(
+                **{self.lookup_field: kwargs[self.lookup_field]}
+            )
+        except (ObjectDoesNotExist, ValidationError, ValueError):
+            raise Http404
+        return self.render(await self.serialize(instance, many=False))
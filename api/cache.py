@@ -0,0 +1,5 @@
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+
+# Cache visible to every worker process (see ``CACHES["shared"]``).
+shared_cache = ConnectionProxy(caches, "shared")
@@ -0,0 +1,174 @@
+"""
+Negotiated response compression and per-endpoint response sizes.
+
+``CompressionMiddleware`` compresses responses whose content type is listed
+in ``settings.COMPRESSION_LEVELS`` -- JSON, NDJSON exports, HTML, CSV --
+with brotli when the client accepts it and the ``brotli`` package is
+installed, gzip otherwise, at the level configured for that type. Everything
+else (certificate PDFs, images, the text/event-stream live feed) passes
+through untouched, as do bodies under ``COMPRESSION_MIN_SIZE`` bytes.
+Streamed responses are gzipped chunk by chunk.
+
+Each process sums the uncompressed and sent bytes per view name and adds
+them to counters in the shared cache every ``COMPRESSION_METRICS_FLUSH``
+seconds; ``manage.py response_sizes`` reports them against
+``RESPONSE_SIZE_BUDGET``.
+"""
+
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from api.cache import shared_cache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+VIEWS_KEY = "response_size_views"
+COUNTER_KEY = "response_size:{}:{}"
+COUNTERS = ("responses", "raw_bytes", "sent_bytes")
+
+
+def accepted_encodings(header):
+    """``{encoding: q}`` from an Accept-Encoding header."""
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.strip().lower()] = q
+    return accepted
+
+
+def choose_encoding(header, streaming=False):
+    accepted = accepted_encodings(header)
+    default = accepted.get("*", 0.0)
+    # brotli is only used for whole bodies; streams are gzipped per chunk
+    if brotli is not None and not streaming and accepted.get("br", default) > 0:
+        return "br"
+    if accepted.get("gzip", default) > 0:
+        return "gzip"
+    return None
+
+
+def compress(content, encoding, level):
+    if encoding == "br":
+        return brotli.compress(content, quality=level)
+    return zlib.compress(content, level, wbits=31)
+
+
+def gzip_stream(chunks, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class ResponseSizes:
+    """Per-process byte totals per view, added to the shared cache in batches."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {}
+        self._flushed_at = time.monotonic()
+
+    def record(self, view, raw, sent):
+        with self._lock:
+            totals = self._totals.setdefault(view, [0, 0, 0])
+            totals[0] += 1
+            totals[1] += raw
+            totals[2] += sent
+            if time.monotonic() - self._flushed_at < settings.COMPRESSION_METRICS_FLUSH:
+                return
+            pending, self._totals = self._totals, {}
+            self._flushed_at = time.monotonic()
+        self.flush(pending)
+
+    def flush(self, pending):
+        views = shared_cache.get(VIEWS_KEY, set())
+        if not views.issuperset(pending):
+            shared_cache.set(VIEWS_KEY, views | set(pending), timeout=None)
+        for view, totals in pending.items():
+            for name, value in zip(COUNTERS, totals):
+                key = COUNTER_KEY.format(view, name)
+                shared_cache.add(key, 0, timeout=None)
+                shared_cache.incr(key, value)
+
+
+response_sizes = ResponseSizes()
+
+
+def size_report():
+    """``{view: {"responses", "raw_bytes", "sent_bytes"}}`` from all processes."""
+    report = {}
+    for view in sorted(shared_cache.get(VIEWS_KEY, set())):
+        keys = [COUNTER_KEY.format(view, name) for name in COUNTERS]
+        values = shared_cache.get_many(keys)
+        report[view] = {
+            name: values.get(key, 0) for name, key in zip(COUNTERS, keys)
+        }
+    return report
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        raw = None if response.streaming else len(response.content)
+        self.compress(request, response)
+        match = getattr(request, "resolver_match", None)
+        if raw is not None and match is not None:
+            response_sizes.record(match.view_name, raw, len(response.content))
+        return response
+
+    def compress(self, request, response):
+        content_type = response.get("Content-Type", "").split(";")[0].strip()
+        levels = settings.COMPRESSION_LEVELS.get(content_type)
+        if (
+            levels is None
+            or response.has_header("Content-Encoding")
+            or "no-transform" in response.get("Cache-Control", "")
+            or (response.streaming and response.is_async)
+            or (
+                not response.streaming
+                and len(response.content) < settings.COMPRESSION_MIN_SIZE
+            )
+        ):
+            return
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = choose_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""), response.streaming
+        )
+        if encoding is None:
+            return
+        if response.streaming:
+            response.streaming_content = gzip_stream(
+                response.streaming_content, levels[encoding]
+            )
+            del response.headers["Content-Length"]
+        else:
+            compressed = compress(response.content, encoding, levels[encoding])
+            if len(compressed) >= len(response.content):
+                return
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+        # a strong ETag names the uncompressed bytes (RFC 9110 8.8.1)
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
@@ -0,0 +1,103 @@
+"""
+Minimal five-field cron expressions (minute hour day month weekday).
+
+Supports ``*``, single values, ``a-b`` ranges, ``,`` lists, ``/step`` and
+the ``@hourly``/``@daily``/``@weekly``/``@monthly`` aliases. Weekdays run
+0-6 from Sunday (7 is also Sunday). As in cron, when both day and weekday
+are restricted a time matches if either does. Times are evaluated in the
+current Django timezone.
+"""
+
+from datetime import timedelta
+
+from django.utils import timezone
+
+ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 7),
+)
+# give up looking for a matching time after this long (e.g. "0 0 31 2 *")
+SEARCH_LIMIT = timedelta(days=366 * 5)
+
+
+def _parse_field(text, name, low, high):
+    values = set()
+    for part in text.split(","):
+        span, _, step = part.partition("/")
+        if span == "*":
+            start, end = low, high
+        elif "-" in span:
+            start, end = (int(bound) for bound in span.split("-", 1))
+        else:
+            start = end = int(span)
+        if step:
+            step = int(step)
+            if step < 1:
+                raise ValueError(f"{name}: step must be positive")
+            if span != "*" and "-" not in span:
+                end = high
+        else:
+            step = 1
+        if not low <= start <= end <= high:
+            raise ValueError(f"{name}: {part!r} is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronExpression:
+    def __init__(self, expression):
+        self.expression = expression
+        fields = ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != len(FIELDS):
+            raise ValueError(f"Expected 5 fields in cron expression {expression!r}")
+        try:
+            parsed = [
+                _parse_field(text, name, low, high)
+                for text, (name, low, high) in zip(fields, FIELDS)
+            ]
+        except ValueError as e:
+            raise ValueError(f"Invalid cron expression {expression!r}: {e}") from None
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {day % 7 for day in weekdays}
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    def __str__(self):
+        return self.expression
+
+    def day_matches(self, value):
+        day = value.day in self.days
+        # Python counts weekdays from Monday, cron from Sunday
+        weekday = (value.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, value):
+        """First matching minute strictly after ``value``."""
+        value = timezone.localtime(value).replace(second=0, microsecond=0)
+        limit = value + SEARCH_LIMIT
+        value += timedelta(minutes=1)
+        while value <= limit:
+            if value.month not in self.months:
+                value = (value.replace(day=1) + timedelta(days=32)).replace(
+                    day=1, hour=0, minute=0
+                )
+            elif not self.day_matches(value):
+                value = (value + timedelta(days=1)).replace(hour=0, minute=0)
+            elif value.hour not in self.hours:
+                value = (value + timedelta(hours=1)).replace(minute=0)
+            elif value.minute not in self.minutes:
+                value += timedelta(minutes=1)
+            else:
+                return value
+        raise ValueError(f"Cron expression {self.expression!r} never matches")
@@ -0,0 +1,114 @@
+"""
+Read-replica routing.
+
+Views opt in with ``ReplicaReadMixin``: their read actions query one of
+``settings.DATABASE_REPLICAS``, everything else stays on ``default``. Reads
+fall back to the primary once the request has written anything, inside a
+transaction, and for ``DATABASE_STICKY_SECONDS`` after the same user's last
+write, so nobody reads their own write back from a lagging replica.
+"""
+
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+from api.cache import shared_cache
+
+PRIMARY = "default"
+# DatabaseCache's table (throttle counters, shared cache) always lives on the
+# primary and writing to it is not a write to the request's data
+CACHE_APP_LABEL = "django_cache"
+STICKY_KEY = "db_sticky_{}"
+
+
+class RoutingState:
+    def __init__(self):
+        self.use_replica = False
+        self.wrote = False
+
+
+_state = ContextVar("db_routing_state", default=None)
+
+
+def mark_sticky(user_id):
+    shared_cache.set(
+        STICKY_KEY.format(user_id), True, timeout=settings.DATABASE_STICKY_SECONDS
+    )
+
+
+def is_sticky(user_id):
+    return shared_cache.get(STICKY_KEY.format(user_id), False)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if (
+            state is None
+            or model._meta.app_label == CACHE_APP_LABEL
+            or not state.use_replica
+            or state.wrote
+            or not settings.DATABASE_REPLICAS
+            or connections[PRIMARY].in_atomic_block
+        ):
+            return PRIMARY
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None and model._meta.app_label != CACHE_APP_LABEL:
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Scopes routing state to one request and starts the sticky window when an
+    authenticated request wrote to the primary.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        # DRF copies the authenticated (token) user back onto the HttpRequest
+        user = getattr(request, "user", None)
+        if state.wrote and user is not None and user.is_authenticated:
+            mark_sticky(user.pk)
+        return response
+
+
+class ReplicaReadMixin:
+    """Send a view's read actions to a replica (see module docstring)."""
+
+    replica_actions = ("list", "retrieve")
+
+    def reads_from_replica(self, request):
+        action = getattr(self, "action", None)
+        if action is not None:
+            if action not in self.replica_actions:
+                return False
+        elif request.method not in SAFE_METHODS:
+            return False
+        return not (request.user.is_authenticated and is_sticky(request.user.pk))
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        state = _state.get()
+        if state is not None and settings.DATABASE_REPLICAS:
+            state.use_replica = self.reads_from_replica(request)
@@ -0,0 +1,62 @@
+"""
+Registry of hot queries checked by ``manage.py explain_hot_queries``.
+
+Apps register querysets in a ``hot_queries`` module::
+
+    @hot_query("comments_for_user")
+    def comments_for_user():
+        return CommentModel.objects.filter(user_id="0")
+
+The command EXPLAINs each one and fails when the plan scans a whole table
+instead of using an index.
+"""
+
+import json
+import re
+
+from django.db import connections, transaction
+from django.utils.module_loading import autodiscover_modules
+
+HOT_QUERIES = {}
+
+
+def hot_query(name):
+    def register(build):
+        HOT_QUERIES[name] = build
+        return build
+
+    return register
+
+
+def load_hot_queries():
+    autodiscover_modules("hot_queries")
+    return HOT_QUERIES
+
+
+def _postgresql_seq_scans(plan):
+    scans = []
+    if plan.get("Node Type") == "Seq Scan":
+        scans.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        scans.extend(_postgresql_seq_scans(child))
+    return scans
+
+
+def explain(queryset, using="default"):
+    """Return ``(plan_text, [tables read by a full scan])`` for ``queryset``."""
+    queryset = queryset.using(using)
+    vendor = connections[using].vendor
+    if vendor == "postgresql":
+        # tiny tables make a seq scan the cheapest plan; disable it so one only
+        # shows up when no index can serve the query
+        with transaction.atomic(using=using):
+            with connections[using].cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = json.loads(queryset.explain(format="json"))[0]["Plan"]
+        return json.dumps(plan, indent=2), _postgresql_seq_scans(plan)
+    if vendor == "sqlite":
+        plan = queryset.explain()
+        # "SCAN table" reads every row; "SCAN table USING INDEX" walks an index
+        scans = re.findall(r"\bSCAN (\w+)$", plan, flags=re.MULTILINE)
+        return plan, scans
+    return queryset.explain(), []
@@ -0,0 +1,181 @@
+"""
+Serializer fast path for large list responses.
+
+A ``FastSerializer`` produces the same output as its ``serializer_class``
+from ``values()`` rows instead of model instances. The serializer's fields
+are compiled once into ``(name, column, converter)`` triples; plain columns
+(strings, numbers, booleans, foreign key ids) are copied as they come from
+the database and the rest go through the DRF field's ``to_representation``.
+Fields that are not a single column -- model methods, nested serializers,
+many-to-many ids -- are declared in ``computed`` as a function of the row,
+and ``attach`` may add data fetched for the whole page in one query::
+
+    class FastCommentSerializer(FastSerializer):
+        serializer_class = CommentSerializer
+        computed = {"total_time": (["created_at", "end_at", "option"], hours)}
+
+Views opt in with ``FastListMixin`` (``settings.FAST_LIST_SERIALIZERS``),
+which also applies the request's field selection (api/fieldsets.py).
+"""
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from api.fieldsets import ALL_FIELDS, FieldSelectionMixin, is_nested
+
+# fields whose to_representation returns database values unchanged
+PASSTHROUGH = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def _column(model, source_attrs):
+    """``values()`` lookup for a dotted field source, or None if not a column."""
+    field = None
+    for attr in source_attrs:
+        if field is not None:
+            if not field.is_relation:
+                return None
+            model = field.related_model
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if field.many_to_many or field.one_to_many:
+            return None
+    return "__".join(source_attrs)
+
+
+def _converter(field):
+    if isinstance(field, PASSTHROUGH) and not getattr(field, "pk_field", None):
+        if not isinstance(field, serializers.ChoiceField) or all(
+            isinstance(key, str) for key in field.choices
+        ):
+            return None
+    return field.to_representation
+
+
+class FastSerializer:
+    serializer_class = None
+    # output field -> (columns it reads, function(row) returning its value)
+    computed = {}
+    # nested relations returned as primary keys when not expanded (see
+    # api/fieldsets.py), for those that are not a foreign key column
+    collapsed = {}
+    # extra annotations the computed fields read, as for QuerySet.annotate
+    annotations = {}
+    _compiled = None
+
+    def __init__(self, selection=ALL_FIELDS):
+        self.selection = selection
+
+    @classmethod
+    def compile(cls):
+        """
+        ``{(name, collapsed): (columns read, column, converter)}`` for every
+        field; nested fields also get their collapsed form.
+        """
+        if cls.__dict__.get("_compiled") is None:
+            model = cls.serializer_class.Meta.model
+            compiled = {}
+            for name, field in cls.serializer_class().fields.items():
+                if field.write_only:
+                    continue
+                nested = is_nested(field)
+                column = _column(model, field.source_attrs or [name])
+                if nested:
+                    if name in cls.collapsed:
+                        reads, function = cls.collapsed[name]
+                        compiled[name, True] = (reads, None, function)
+                    elif column is not None:
+                        compiled[name, True] = ([column], column, None)
+                if name in cls.computed:
+                    reads, function = cls.computed[name]
+                    compiled[name, False] = (reads, None, function)
+                elif column is not None and not nested:
+                    compiled[name, False] = ([column], column, _converter(field))
+                else:
+                    raise ImproperlyConfigured(
+                        f"{cls.__name__}: {name!r} is not a column of "
+                        f"{model.__name__}; declare it in computed"
+                    )
+                if nested and (name, True) not in compiled:
+                    raise ImproperlyConfigured(
+                        f"{cls.__name__}: declare how {name!r} is collapsed"
+                    )
+            cls._compiled = compiled
+        return cls._compiled
+
+    def plan(self):
+        """The selected fields as ``(name, column, converter)`` and columns."""
+        compiled = self.compile()
+        names = [name for name, collapsed in compiled if not collapsed]
+        nested = [name for name, collapsed in compiled if collapsed]
+        self.selection.check(names, nested)
+        fields, columns = [], set()
+        for name in names:
+            if not self.selection.selects(name):
+                continue
+            collapsed = name in nested and not self.selection.expands(name)
+            reads, column, convert = compiled[name, collapsed]
+            columns.update(reads)
+            fields.append((name, column, convert))
+        return fields, columns
+
+    def includes(self, name):
+        return self.selection.includes(name)
+
+    def rows(self, queryset):
+        """``queryset`` as the ``values()`` rows the fields are built from."""
+        _, columns = self.plan()
+        annotations = {
+            name: value for name, value in self.annotations.items() if name in columns
+        }
+        queryset = queryset.prefetch_related(None)
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        return queryset.values(*sorted(columns - set(annotations)), *annotations)
+
+    def attach(self, rows):
+        """Add data fetched for the whole page to ``rows`` (a list of dicts)."""
+
+    def serialize(self, rows):
+        fields, _ = self.plan()
+        rows = list(rows)
+        self.attach(rows)
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, convert in fields:
+                if column is None:
+                    item[name] = convert(row)
+                    continue
+                value = row[column]
+                if convert is None or value is None:
+                    item[name] = value
+                else:
+                    item[name] = convert(value)
+            data.append(item)
+        return data
+
+
+class FastListMixin(FieldSelectionMixin):
+    """Build ``list`` responses with ``fast_serializer_class``."""
+
+    fast_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if not settings.FAST_LIST_SERIALIZERS:
+            return super().list(request, *args, **kwargs)
+        fast = self.fast_serializer_class(self.get_field_selection())
+        rows = fast.rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast.serialize(page))
+        return Response(fast.serialize(rows))
@@ -0,0 +1,115 @@
+"""
+Sparse fieldsets and expansion of nested relations, chosen by the client.
+
+``?fields=id,title,total_comments`` returns only the listed top-level fields.
+Once ``fields`` or ``expand`` is given, nested relations (e.g. a campaign's
+``creator``) are returned as primary keys unless named in ``expand``, which
+also adds them to ``fields``: ``?fields=id,title&expand=creator``. Without
+either parameter responses are unchanged.
+
+Views mix in ``FieldSelectionMixin`` and serializers ``SparseFieldsMixin``;
+fields that are not returned are never read, so the relations behind them
+are not queried. ``selection.includes(name)`` tells a view which relations
+to select or prefetch.
+"""
+
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _names(value):
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+class FieldSelection:
+    def __init__(self, fields=None, expand=None):
+        # None: every field / every nested relation expanded
+        self.expand = expand
+        if fields is not None and expand:
+            fields = fields | expand
+        self.fields = fields
+
+    @classmethod
+    def from_request(cls, request):
+        params = request.query_params
+        if "fields" not in params and "expand" not in params:
+            return None
+        fields = _names(params["fields"]) if "fields" in params else None
+        return cls(fields, _names(params.get("expand", "")))
+
+    def selects(self, name):
+        return self.fields is None or name in self.fields
+
+    def expands(self, name):
+        return self.expand is None or name in self.expand
+
+    def includes(self, name):
+        """True if ``name`` is returned, and expanded if it is nested."""
+        return self.selects(name) and self.expands(name)
+
+    def check(self, available, nested):
+        unknown = (self.fields or set()) - set(available)
+        if unknown:
+            raise ValidationError(
+                {"fields": f"Unknown fields: {', '.join(sorted(unknown))}"}
+            )
+        unknown = (self.expand or set()) - set(nested)
+        if unknown:
+            raise ValidationError(
+                {"expand": f"Cannot expand: {', '.join(sorted(unknown))}"}
+            )
+
+
+ALL_FIELDS = FieldSelection()
+
+
+class FieldSelectionMixin:
+    """Pass the request's ``fields``/``expand`` selection to the serializer."""
+
+    def get_field_selection(self):
+        if not hasattr(self, "_field_selection"):
+            selection = None
+            if self.request.method in SAFE_METHODS:
+                selection = FieldSelection.from_request(self.request)
+            self._field_selection = selection or ALL_FIELDS
+        return self._field_selection
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["field_selection"] = self.get_field_selection()
+        return context
+
+
+def is_nested(field):
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    return isinstance(field, serializers.BaseSerializer)
+
+
+class SparseFieldsMixin:
+    """Drop unselected fields and collapse unexpanded nested serializers."""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = self.context.get("field_selection", ALL_FIELDS)
+        # only the response's own fields; nested serializers are left whole
+        top_level = self.parent is None or (
+            isinstance(self.parent, serializers.ListSerializer)
+            and self.parent.parent is None
+        )
+        if selection is ALL_FIELDS or not top_level:
+            return fields
+        selection.check(fields, [name for name in fields if is_nested(fields[name])])
+        selected = {}
+        for name, field in fields.items():
+            if not selection.selects(name):
+                continue
+            if is_nested(field) and not selection.expands(name):
+                field = serializers.PrimaryKeyRelatedField(
+                    read_only=True,
+                    many=isinstance(field, serializers.ListSerializer),
+                    source=field.source,
+                )
+            selected[name] = field
+        return selected
@@ -0,0 +1,175 @@
+"""
+Primary key generation.
+
+All three schemes are ordered by time, so new keys land at the right edge of
+a B-tree index instead of on a random page:
+
+* ``uuid7`` -- RFC 9562 version 7 UUIDs: a 48-bit millisecond timestamp then
+  74 random bits; still an ordinary UUID to the database and API clients.
+* ``next_id`` -- integers from a named sequence, reserved from ``IdSequence``
+  one block per process at a time, so they are unique without a lookup.
+* ``sortable_id`` -- short lowercase strings: timestamp then random suffix.
+"""
+
+import os
+import secrets
+import threading
+import time
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+
+from api.cache import shared_cache
+
+PRIMARY = "default"
+BASE36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+BLOCKS_KEY = "id_blocks_{}"
+COLLISIONS_KEY = "id_collisions_{}"
+
+
+def uuid7(timestamp_ms=None):
+    if timestamp_ms is None:
+        timestamp_ms = time.time_ns() // 1_000_000
+    rand_a, rand_b = divmod(int.from_bytes(os.urandom(10), "big"), 1 << 68)
+    value = (
+        (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76
+        | (rand_a & 0xFFF) << 64
+        | 0b10 << 62
+        | (rand_b & 0x3FFF_FFFF_FFFF_FFFF)
+    )
+    return uuid.UUID(int=value)
+
+
+def uuid7_from_datetime(value):
+    """A version 7 UUID carrying ``value``'s timestamp, for backfilling rows."""
+    return uuid7(int(value.timestamp() * 1000))
+
+
+class BlockSequence:
+    """
+    Hands out ``next_id`` values from a block reserved in ``IdSequence``.
+    Blocks are never shared between processes (a block reserved before a
+    fork is dropped in the child), so allocated ids never collide; gaps are
+    left when a process exits with part of its block unused.
+    """
+
+    def __init__(self, name, start):
+        self.name = name
+        self.start = start
+        self._lock = threading.Lock()
+        self._next = self._end = 0
+        self._pid = None
+
+    def reserve_block(self):
+        connection = connections[PRIMARY]
+        if connection.in_atomic_block and connection.vendor != "sqlite":
+            # commit the reservation on its own connection: if the caller's
+            # transaction rolled back, another process could get this block too
+            # (SQLite allows a single writer, so there it is reserved inline)
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                return pool.submit(self._reserve_on_own_connection).result()
+        return self._reserve()
+
+    def _reserve_on_own_connection(self):
+        try:
+            return self._reserve()
+        finally:
+            connections[PRIMARY].close()
+
+    def _reserve(self):
+        from api.models import IdSequence
+
+        size = settings.ID_BLOCK_SIZE
+        with transaction.atomic(using=PRIMARY):
+            IdSequence.objects.using(PRIMARY).get_or_create(
+                name=self.name, defaults={"next_value": self.start}
+            )
+            # the UPDATE locks the row until commit, so reservations serialize
+            IdSequence.objects.using(PRIMARY).filter(name=self.name).update(
+                next_value=F("next_value") + size
+            )
+            end = (
+                IdSequence.objects.using(PRIMARY)
+                .values_list("next_value", flat=True)
+                .get(name=self.name)
+            )
+        _incr_metric(BLOCKS_KEY.format(self.name))
+        return end - size, end
+
+    def __next__(self):
+        with self._lock:
+            if self._pid != os.getpid() or self._next >= self._end:
+                self._next, self._end = self.reserve_block()
+                self._pid = os.getpid()
+            value = self._next
+            self._next += 1
+            return value
+
+
+_sequences = {}
+_sequences_lock = threading.Lock()
+
+
+def next_id(name, start=1):
+    """Next value of sequence ``name``; a new sequence begins at ``start``."""
+    with _sequences_lock:
+        if name not in _sequences:
+            _sequences[name] = BlockSequence(name, start)
+    return next(_sequences[name])
+
+
+def advance_sequence(name, past):
+    """
+    Move sequence ``name`` beyond ``past`` (e.g. the highest id in the table
+    after a backup restore rewound the sequence) and drop this process's block.
+    """
+    from api.models import IdSequence
+
+    IdSequence.objects.using(PRIMARY).filter(name=name, next_value__lte=past).update(
+        next_value=past + 1
+    )
+    with _sequences_lock:
+        _sequences.pop(name, None)
+
+
+def _incr_metric(key):
+    try:
+        shared_cache.incr(key)
+    except ValueError:
+        shared_cache.add(key, 0, timeout=None)
+        shared_cache.incr(key)
+
+
+def record_collision(name):
+    """Count an insert that hit an existing primary key for sequence ``name``."""
+    _incr_metric(COLLISIONS_KEY.format(name))
+
+
+def id_metrics(name):
+    return {
+        "blocks": shared_cache.get(BLOCKS_KEY.format(name), 0),
+        "collisions": shared_cache.get(COLLISIONS_KEY.format(name), 0),
+    }
+
+
+def sortable_id(length=15):
+    """
+    Lowercase base-36 string that sorts by creation time: 9 characters of
+    millisecond timestamp followed by random characters.
+    """
+    timestamp = _base36(time.time_ns() // 1_000_000).rjust(9, "0")
+    random_part = "".join(secrets.choice(BASE36) for _ in range(length - 9))
+    return timestamp + random_part
+
+
+def _base36(number):
+    digits = []
+    while number:
+        number, digit = divmod(number, 36)
+        digits.append(BASE36[digit])
+    return "".join(reversed(digits)) or "0"
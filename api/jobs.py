@@ -0,0 +1,9 @@
+from api import warmup
+from api.scheduler import job
+
+
+@job(cron="*/10 * * * *")
+def warm_caches():
+    """Rebuild every warm cache group before its entries go stale."""
+    for group in warmup.GROUPS:
+        warmup.warm(group)
@@ -0,0 +1,70 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures per-request database connection overhead: simulated requests "
+        "that open a new connection each time versus ones reusing a persistent "
+        "(or pooled, when DB_POOL is on) connection"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--queries", type=int, default=1)
+        parser.add_argument("--database", default="default")
+
+    def measure(self, connection, max_age, requests, queries):
+        """Time ``requests`` request cycles run with ``CONN_MAX_AGE=max_age``."""
+        connection.close()
+        connection.settings_dict["CONN_MAX_AGE"] = max_age
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            # close_old_connections runs on both signals, as in a real request
+            request_started.send(sender=self.__class__)
+            with connection.cursor() as cursor:
+                for _ in range(queries):
+                    cursor.execute("SELECT 1")
+                    cursor.fetchone()
+            request_finished.send(sender=self.__class__)
+            timings.append((time.perf_counter() - started) * 1000)
+        connection.close()
+        return timings
+
+    def report(self, label, timings):
+        percentiles = statistics.quantiles(timings, n=20)
+        self.stdout.write(
+            f"{label:<12}{statistics.mean(timings):>9.2f}"
+            f"{statistics.median(timings):>9.2f}{percentiles[18]:>9.2f}"
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        requests, queries = options["requests"], options["queries"]
+        configured = connection.settings_dict["CONN_MAX_AGE"]
+        pooled = bool(connection.settings_dict["OPTIONS"].get("pool"))
+        self.stdout.write(
+            f"{connection.vendor} {options['database']}, {requests} requests x "
+            f"{queries} queries (CONN_MAX_AGE={configured}, pool={pooled})"
+        )
+        self.stdout.write(f"{'':<12}{'mean ms':>9}{'p50 ms':>9}{'p95 ms':>9}")
+        try:
+            if pooled:
+                # with a pool, closing hands the connection back instead
+                self.report("pooled", self.measure(connection, 0, requests, queries))
+                return
+            fresh = self.measure(connection, 0, requests, queries)
+            reused = self.measure(connection, None, requests, queries)
+        finally:
+            connection.settings_dict["CONN_MAX_AGE"] = configured
+        self.report("new", fresh)
+        self.report("persistent", reused)
+        self.stdout.write(
+            "connection overhead per request: "
+            f"{statistics.mean(fresh) - statistics.mean(reused):.2f} ms"
+        )
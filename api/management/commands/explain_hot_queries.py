@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.explain import explain, load_hot_queries
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs EXPLAIN on every registered hot query (see api/explain.py) and "
+        "fails if any of them reads a whole table instead of using an index"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("names", nargs="*", help="only check these queries")
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        queries = load_hot_queries()
+        unknown = set(options["names"]) - set(queries)
+        if unknown:
+            raise CommandError(f"Unknown hot queries: {', '.join(sorted(unknown))}")
+
+        failed = []
+        for name, build in sorted(queries.items()):
+            if options["names"] and name not in options["names"]:
+                continue
+            plan, scans = explain(build(), using=options["database"])
+            if options["verbosity"] > 1:
+                self.stdout.write(plan)
+            if scans:
+                failed.append(name)
+                self.stdout.write(
+                    self.style.ERROR(f"{name}: sequential scan on {', '.join(scans)}")
+                )
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{name}: ok"))
+        if failed:
+            raise CommandError(f"{len(failed)} hot queries use a sequential scan")
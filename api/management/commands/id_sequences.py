@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from api.ids import id_metrics
+from api.models import IdSequence
+
+
+class Command(BaseCommand):
+    help = (
+        "Lists id sequences with their next value, blocks reserved and primary "
+        "key collisions recorded (these should stay at 0)"
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'sequence':<16}{'next value':>16}{'blocks':>10}{'collisions':>12}"
+        )
+        for sequence in IdSequence.objects.order_by("name"):
+            metrics = id_metrics(sequence.name)
+            self.stdout.write(
+                f"{sequence.name:<16}{sequence.next_value:>16}"
+                f"{metrics['blocks']:>10}{metrics['collisions']:>12}"
+            )
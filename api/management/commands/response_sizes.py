@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.compression import brotli, size_report
+
+
+class Command(BaseCommand):
+    help = (
+        "Lists the average uncompressed and sent size of responses per view, "
+        "flagging views over RESPONSE_SIZE_BUDGET bytes sent"
+    )
+
+    def handle(self, *args, **options):
+        budget = settings.RESPONSE_SIZE_BUDGET
+        self.stdout.write(
+            f"brotli: {'yes' if brotli else 'no (gzip only)'}; "
+            f"budget {budget / 1024:.0f} KiB sent per response"
+        )
+        self.stdout.write(
+            f"{'view':<28}{'responses':>10}{'avg KiB':>10}{'sent KiB':>10}"
+            f"{'ratio':>8}"
+        )
+        for view, sizes in size_report().items():
+            responses = sizes["responses"] or 1
+            raw = sizes["raw_bytes"] / responses
+            sent = sizes["sent_bytes"] / responses
+            ratio = raw / sent if sent else 1
+            self.stdout.write(
+                f"{view:<28}{sizes['responses']:>10}{raw / 1024:>10.1f}"
+                f"{sent / 1024:>10.1f}{ratio:>7.1f}x"
+                f"{'  over budget' if sent > budget else ''}"
+            )
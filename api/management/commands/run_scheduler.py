@@ -0,0 +1,76 @@
+import os
+import socket
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import localtime
+
+from api.models import ScheduledJob
+from api.scheduler import (
+    acquire_lease,
+    load_jobs,
+    release_lease,
+    run_due_jobs,
+    run_job,
+    sync_jobs,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the jobs registered in each app's jobs.py on their cron schedules. "
+        "Start one or more; only the current lease holder runs jobs. The lease "
+        "must outlast the longest job."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=30.0)
+        parser.add_argument("--lease", type=int, default=300)
+        parser.add_argument(
+            "--once", action="store_true", help="check for due jobs once and exit"
+        )
+        parser.add_argument(
+            "--run", metavar="JOB", help="run one job now, ignoring its schedule"
+        )
+        parser.add_argument("--list", action="store_true")
+
+    def handle(self, *args, **options):
+        jobs = load_jobs()
+        sync_jobs()
+        if options["list"]:
+            for scheduled in ScheduledJob.objects.order_by("name"):
+                state = "" if scheduled.name in jobs else " (not registered)"
+                next_run_at = scheduled.next_run_at and localtime(scheduled.next_run_at)
+                self.stdout.write(
+                    f"{scheduled.name:<32}{scheduled.cron:<16}"
+                    f"next {next_run_at}  last {scheduled.last_status or '-'}"
+                    f"{'' if scheduled.enabled else ' (disabled)'}{state}"
+                )
+            return
+        if options["run"]:
+            if options["run"] not in jobs:
+                raise CommandError(f"Unknown job {options['run']!r}")
+            status = run_job(ScheduledJob.objects.get(name=options["run"]))
+            self.stdout.write(f"{options['run']}: {status}")
+            return
+
+        holder = f"{socket.gethostname()}:{os.getpid()}"
+        leading = False
+        try:
+            while True:
+                if acquire_lease(holder, options["lease"]):
+                    if not leading:
+                        self.stdout.write(f"{holder} is now the scheduler leader")
+                        leading = True
+                    for name in run_due_jobs(holder, options["lease"]):
+                        self.stdout.write(f"ran {name}")
+                elif leading:
+                    self.stdout.write(f"{holder} lost the scheduler lease")
+                    leading = False
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            release_lease(holder)
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import warmup
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the warm-cached list responses (first pages, common filters) "
+        "so the first requests after a deploy are not cache misses"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "groups", nargs="*", help="Cache groups to warm (default: all)"
+        )
+
+    def handle(self, *args, **options):
+        groups = options["groups"] or sorted(warmup.GROUPS)
+        unknown = set(groups) - set(warmup.GROUPS)
+        if unknown:
+            raise CommandError(
+                f"Unknown cache groups: {', '.join(sorted(unknown))} "
+                f"(choose from {', '.join(sorted(warmup.GROUPS))})"
+            )
+        for group in groups:
+            started = time.monotonic()
+            pages = warmup.warm(group)
+            self.stdout.write(
+                f"{group}: {pages} pages in {time.monotonic() - started:.2f}s"
+            )
@@ -0,0 +1,58 @@
+from django.core.exceptions import ValidationError
+from django.db import models
+
+from api.cron import CronExpression
+
+
+class IdSequence(models.Model):
+    """
+    Next unallocated value of a named id sequence. Processes reserve blocks
+    of ``ID_BLOCK_SIZE`` values at a time (see ``api.ids.next_id``), so this
+    row is written once per block rather than once per insert.
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    next_value = models.BigIntegerField()
+
+    def __str__(self):
+        return f"{self.name}: {self.next_value}"
+
+
+class ScheduledJob(models.Model):
+    """
+    Schedule and last outcome of a job registered with ``api.scheduler.job``.
+    Rows are created from the registry by ``run_scheduler``; ``cron`` and
+    ``enabled`` can then be changed in the admin.
+    """
+
+    name = models.CharField(max_length=100, primary_key=True)
+    cron = models.CharField(max_length=100)
+    enabled = models.BooleanField(default=True)
+    next_run_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    last_status = models.CharField(max_length=10, blank=True)
+    last_error = models.TextField(blank=True)
+    last_duration = models.FloatField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.cron})"
+
+    def clean(self):
+        try:
+            CronExpression(self.cron)
+        except ValueError as e:
+            raise ValidationError({"cron": str(e)})
+
+
+class SchedulerLease(models.Model):
+    """
+    Leadership of the scheduler: the worker named in ``holder`` runs jobs
+    until ``expires_at`` and keeps renewing the lease while it is alive.
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    holder = models.CharField(max_length=255, blank=True)
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name}: {self.holder} until {self.expires_at}"
@@ -0,0 +1,127 @@
+"""
+Database-backed periodic jobs, run by ``manage.py run_scheduler``.
+
+Apps register jobs in a ``jobs`` module::
+
+    @job(cron="*/5 * * * *")
+    def accrue_volunteer_points():
+        ...
+
+Any number of scheduler processes may run; the one holding the
+``SchedulerLease`` row runs due jobs and the rest stand by. The lease is
+taken with a single conditional UPDATE, so the row lock decides the leader
+on PostgreSQL and SQLite alike.
+"""
+
+import logging
+import time
+import traceback
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from api.cron import CronExpression
+from api.models import ScheduledJob, SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "scheduler"
+JOBS = {}
+
+
+def job(name=None, cron="* * * * *"):
+    CronExpression(cron)  # fail at import time on a bad expression
+
+    def register(func):
+        JOBS[name or func.__name__] = (func, cron)
+        return func
+
+    return register
+
+
+def load_jobs():
+    autodiscover_modules("jobs")
+    return JOBS
+
+
+def sync_jobs(now=None):
+    """Create rows for newly registered jobs, scheduled from ``now``."""
+    now = now or timezone.now()
+    for name, (func, cron) in JOBS.items():
+        next_run_at = CronExpression(cron).next_after(now)
+        ScheduledJob.objects.get_or_create(
+            name=name, defaults={"cron": cron, "next_run_at": next_run_at}
+        )
+
+
+def acquire_lease(holder, seconds):
+    """Take or renew the scheduler lease for ``holder``; True if it is held."""
+    now = timezone.now()
+    SchedulerLease.objects.get_or_create(
+        name=LEASE_NAME, defaults={"holder": "", "expires_at": now}
+    )
+    return bool(
+        SchedulerLease.objects.filter(name=LEASE_NAME)
+        .filter(Q(holder=holder) | Q(expires_at__lte=now))
+        .update(holder=holder, expires_at=now + timedelta(seconds=seconds))
+    )
+
+
+def release_lease(holder):
+    SchedulerLease.objects.filter(name=LEASE_NAME, holder=holder).update(
+        expires_at=timezone.now()
+    )
+
+
+def run_job(scheduled):
+    """Run ``scheduled`` now and record the outcome and its next run time."""
+    func, _ = JOBS[scheduled.name]
+    started = time.monotonic()
+    scheduled.last_run_at = timezone.now()
+    try:
+        func()
+    except Exception:
+        logger.exception("Scheduled job %s failed", scheduled.name)
+        scheduled.last_status = "failed"
+        scheduled.last_error = traceback.format_exc()
+    else:
+        scheduled.last_status = "ok"
+        scheduled.last_error = ""
+    scheduled.last_duration = time.monotonic() - started
+    # only the run's own fields: cron or enabled may have been edited in the
+    # admin while the job ran
+    fields = ["last_run_at", "last_status", "last_error", "last_duration"]
+    cron = (
+        ScheduledJob.objects.filter(pk=scheduled.pk)
+        .values_list("cron", flat=True)
+        .first()
+    )
+    try:
+        scheduled.next_run_at = CronExpression(cron or scheduled.cron).next_after(
+            timezone.now()
+        )
+        fields.append("next_run_at")
+    except ValueError as e:
+        # an invalid expression saved outside the admin: park the job
+        scheduled.enabled = False
+        scheduled.last_error = str(e)
+        fields.append("enabled")
+    scheduled.save(update_fields=fields)
+    return scheduled.last_status
+
+
+def run_due_jobs(holder, lease_seconds):
+    """Run every enabled job whose time has come; returns the names run."""
+    due = ScheduledJob.objects.filter(
+        enabled=True, next_run_at__lte=timezone.now(), name__in=list(JOBS)
+    ).order_by("next_run_at", "name")
+    ran = []
+    for scheduled in due:
+        # renew before each job so a long one does not hand over leadership
+        if not acquire_lease(holder, lease_seconds):
+            break
+        run_job(scheduled)
+        ran.append(scheduled.name)
+    return ran
@@ -0,0 +1,40 @@
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import action
+from rest_framework.utils import encoders
+
+
+class NDJSONExportMixin:
+    """
+    Adds an ``export/`` list route that streams the queryset as
+    newline-delimited JSON. Rows are read with ``.iterator()`` and serialized
+    one at a time, so memory use does not grow with the table.
+    """
+
+    export_chunk_size = 2000
+    export_filename = "export.ndjson"
+
+    def get_export_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def get_export_serializer_class(self):
+        return self.get_serializer_class()
+
+    def stream_rows(self, queryset):
+        serializer_class = self.get_export_serializer_class()
+        context = self.get_serializer_context()
+        for instance in queryset.iterator(chunk_size=self.export_chunk_size):
+            data = serializer_class(instance, context=context).data
+            yield json.dumps(data, cls=encoders.JSONEncoder, ensure_ascii=False) + "\n"
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request, *args, **kwargs):
+        response = StreamingHttpResponse(
+            self.stream_rows(self.get_export_queryset()),
+            content_type="application/x-ndjson",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{self.export_filename}"'
+        )
+        return response
@@ -0,0 +1,95 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from app.user.models import SkillsModel
+
+from . import scheduler
+from .db_routers import PRIMARY, ReplicaRouter, RoutingState, _state
+from .models import ScheduledJob, SchedulerLease
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.state = RoutingState()
+        self.addCleanup(_state.reset, _state.set(self.state))
+
+    def test_reads_stay_on_the_primary_unless_the_view_opts_in(self):
+        self.assertEqual(self.router.db_for_read(SkillsModel), PRIMARY)
+        self.state.use_replica = True
+        self.assertEqual(self.router.db_for_read(SkillsModel), "replica")
+
+    def test_reads_follow_a_write_to_the_primary(self):
+        self.state.use_replica = True
+        self.assertEqual(self.router.db_for_write(SkillsModel), PRIMARY)
+        self.assertEqual(self.router.db_for_read(SkillsModel), PRIMARY)
+
+    def test_reads_in_a_transaction_use_the_primary(self):
+        self.state.use_replica = True
+        primary = mock.Mock(in_atomic_block=True)
+        with mock.patch("api.db_routers.connections", {PRIMARY: primary}):
+            self.assertEqual(self.router.db_for_read(SkillsModel), PRIMARY)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_configured(self):
+        self.state.use_replica = True
+        self.assertEqual(self.router.db_for_read(SkillsModel), PRIMARY)
+
+
+class SchedulerLeaseTests(TestCase):
+    def test_one_holder_at_a_time(self):
+        self.assertTrue(scheduler.acquire_lease("first", 60))
+        self.assertTrue(scheduler.acquire_lease("first", 60))
+        self.assertFalse(scheduler.acquire_lease("second", 60))
+        scheduler.release_lease("second")
+        self.assertFalse(scheduler.acquire_lease("second", 60))
+        scheduler.release_lease("first")
+        self.assertTrue(scheduler.acquire_lease("second", 60))
+
+    def test_expired_lease_is_taken_over(self):
+        self.assertTrue(scheduler.acquire_lease("first", 60))
+        SchedulerLease.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertTrue(scheduler.acquire_lease("second", 60))
+        self.assertEqual(SchedulerLease.objects.get().holder, "second")
+
+
+class RunJobTests(TestCase):
+    def run_job(self, func):
+        self.addCleanup(scheduler.JOBS.pop, "test_job", None)
+        scheduler.JOBS["test_job"] = (func, "* * * * *")
+        scheduled = ScheduledJob.objects.create(
+            name="test_job", cron="* * * * *", next_run_at=timezone.now()
+        )
+        status = scheduler.run_job(scheduled)
+        scheduled.refresh_from_db()
+        return status, scheduled
+
+    def test_records_the_outcome(self):
+        status, scheduled = self.run_job(lambda: None)
+        self.assertEqual((status, scheduled.last_error), ("ok", ""))
+        self.assertGreater(scheduled.next_run_at, scheduled.last_run_at)
+
+    def test_records_the_error(self):
+        def fail():
+            raise RuntimeError("boom")
+
+        with self.assertLogs("api.scheduler", "ERROR"):
+            status, scheduled = self.run_job(fail)
+        self.assertEqual(status, "failed")
+        self.assertIn("RuntimeError: boom", scheduled.last_error)
+
+    def test_keeps_admin_edits_made_while_running(self):
+        def edit():
+            ScheduledJob.objects.filter(name="test_job").update(
+                cron="0 3 * * *", enabled=False
+            )
+
+        status, scheduled = self.run_job(edit)
+        self.assertEqual(status, "ok")
+        self.assertEqual((scheduled.cron, scheduled.enabled), ("0 3 * * *", False))
+        local = timezone.localtime(scheduled.next_run_at)
+        self.assertEqual((local.hour, local.minute), (3, 0))
@@ -0,0 +1,62 @@
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
+
+from .cache import shared_cache
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    Sliding-window counter over the shared cache. Each key keeps two integers
+    (the current and previous fixed window) instead of a list of timestamps;
+    the previous window is weighted by how much of it still overlaps the
+    sliding window.
+    """
+
+    cache = shared_cache
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        current_key = f"{self.key}_{window}"
+        previous_key = f"{self.key}_{window - 1}"
+        counts = self.cache.get_many([current_key, previous_key])
+
+        overlap = 1 - (self.now % self.duration) / self.duration
+        self.estimate = counts.get(previous_key, 0) * overlap + counts.get(
+            current_key, 0
+        )
+        if self.estimate >= self.num_requests:
+            return self.throttle_failure()
+
+        try:
+            self.cache.incr(current_key)
+        except ValueError:
+            if not self.cache.add(current_key, 1, timeout=self.duration * 2):
+                self.cache.incr(current_key)
+        return True
+
+    def wait(self):
+        return self.duration - (self.now % self.duration)
+
+
+class SharedAnonRateThrottle(AnonRateThrottle, SlidingWindowRateThrottle):
+    pass
+
+
+class SharedUserRateThrottle(UserRateThrottle, SlidingWindowRateThrottle):
+    pass
+
+
+class SharedScopedRateThrottle(ScopedRateThrottle, SlidingWindowRateThrottle):
+    pass
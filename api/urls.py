@@ -1,6 +1,5 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenRefreshView
 
 from app.event import views as event_view
 from app.user import views as user_view
@@ -9,6 +8,9 @@ router = DefaultRouter()
 router.register(r"campaigns", event_view.CampaignViewSet, basename="campaign")
 router.register(r"events", event_view.EventViewAPI, basename="eventView")
 router.register(r"comments", event_view.CommentViewSet, basename="comment")
+router.register(
+    r"registrations", event_view.RegistrationExportViewSet, basename="registration"
+)
 urlpatterns = [
     path("", include(router.urls)),
     path("user/list/<user_id>/", user_view.UserAPIView.as_view(), name="userView"),
@@ -16,6 +18,11 @@ urlpatterns = [
     path(
         "user/registration/", user_view.CreateUserAPIView.as_view(), name="createUser"
     ),
+    path(
+        "user/bulk/provision/",
+        user_view.BulkProvisionUsersAPIView.as_view(),
+        name="bulkProvisionUsers",
+    ),
     path(
         "user/activate/<uid64>/<token>/",
         user_view.activate_account,
@@ -23,7 +30,11 @@ urlpatterns = [
     ),
     # login token:
     path("user/token/", user_view.LoginTokenAPIView.as_view(), name="tokenAccess"),
-    path("user/token/refresh", TokenRefreshView.as_view(), name="tokenRefresh"),
+    path(
+        "user/token/refresh",
+        user_view.TokenRefreshAPIView.as_view(),
+        name="tokenRefresh",
+    ),
     # password:
     path(
         "user/<email>/password/reset/",
@@ -52,6 +63,7 @@ urlpatterns = [
     # location:
     path("event/location/", event_view.LocationApiView.as_view(), name="eventLocation"),
     path("event/register/", event_view.EventRegister.as_view(), name="eventRegister"),
+    path("campaign/live/", event_view.campaign_live_stream, name="campaignLive"),
     path(
         "campaign/history/<user_id>",
         event_view.VolunteerHistory.as_view(),
@@ -62,6 +74,49 @@ urlpatterns = [
         event_view.RecentPost.as_view(),
         name="postHistory",
     ),
+    # activity feed:
+    path("feed/<user_id>/", event_view.FeedAPIView.as_view(), name="activityFeed"),
+    # contribution statistics:
+    path("stats/", event_view.ContributionStats.as_view(), name="contributionStats"),
+    # analytics export:
+    path(
+        "analytics/<dataset>/export/",
+        event_view.ActivityExport.as_view(),
+        name="activityExport",
+    ),
+    # async (ASGI) read-only endpoints:
+    path("async/events/", event_view.AsyncEventList.as_view(), name="asyncEvents"),
+    path(
+        "async/events/<event_id>/",
+        event_view.AsyncEventDetail.as_view(),
+        name="asyncEventDetail",
+    ),
+    path(
+        "async/campaigns/",
+        event_view.AsyncCampaignList.as_view(),
+        name="asyncCampaigns",
+    ),
+    path(
+        "async/campaigns/<int:pk>/",
+        event_view.AsyncCampaignDetail.as_view(),
+        name="asyncCampaignDetail",
+    ),
+    path(
+        "async/event/location/",
+        event_view.AsyncLocationList.as_view(),
+        name="asyncEventLocation",
+    ),
+    path(
+        "async/user/list/<user_id>/",
+        user_view.AsyncUserList.as_view(),
+        name="asyncUserView",
+    ),
+    path("async/skills/list/", user_view.AsyncSkillList.as_view(), name="asyncSkills"),
+    path(
+        "async/interests/list/",
+        user_view.AsyncInterestList.as_view(),
+        name="asyncInterests",
+    ),
     # Generate Certificate:
     path(
         "certificate/<user_id>/",
@@ -0,0 +1,237 @@
+"""
+Stale-while-revalidate caching for public list endpoints.
+
+A view using ``WarmCacheMixin`` caches its list response in the shared cache,
+per path and query string, under a cache group registered with
+``cache_group``; only query strings made of parameters the view reads are
+cached. Saving or deleting one of the group's models invalidates the
+group once the write commits: its entries are never served again, so the
+next read sees the write, and the group's warm targets (first pages, common
+filters) are rebuilt in the background. Entries that merely expired are
+served stale while one request schedules their rebuild; the new response
+replaces the old in a single cache write. A miss is built by the request
+itself. Background rebuilds run outside ``ReplicaRoutingMiddleware`` and so
+read from the primary: a rebuild right after a write never caches replica
+lag.
+"""
+
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from rest_framework.response import Response
+
+from api.cache import shared_cache
+
+ENTRY_KEY = "warm:{}:{}"
+VERSION_KEY = "warm_version:{}"
+LOCK_KEY = "warm_lock:{}"
+GROUP_LOCK_KEY = "warm_group_lock:{}"
+# how long a rebuild may hold the lock before another request may start one
+LOCK_TIMEOUT = 30
+
+GROUPS = {}
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def cache_group(name, targets, models=()):
+    """
+    Register group ``name``: ``targets`` are ``(url_name, query)`` pairs
+    rebuilt after every invalidation; saving or deleting ``models`` (or
+    changing their many-to-many fields) invalidates it.
+    """
+    GROUPS[name] = targets
+
+    def invalidate_group(sender, **kwargs):
+        invalidate(name)
+
+    senders = [(post_save, model) for model in models]
+    senders += [(post_delete, model) for model in models]
+    senders += [
+        (m2m_changed, field.remote_field.through)
+        for model in models
+        for field in model._meta.many_to_many
+    ]
+    for signal, sender in senders:
+        signal.connect(
+            invalidate_group,
+            sender=sender,
+            weak=False,
+            dispatch_uid=f"warm_{name}_{id(signal)}_{sender._meta.label}",
+        )
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-warmup")
+    return _pool
+
+
+def _entry_key(group, request):
+    query = sorted(
+        (
+            (key, value)
+            for key, values in request.GET.lists()
+            for value in values
+            # ?page=1 is the same page as no page at all
+            if not (key == "page" and value == "1")
+        ),
+        key=itemgetter(0),
+    )
+    digest = hashlib.md5(f"{request.path}?{urlencode(query)}".encode()).hexdigest()
+    return ENTRY_KEY.format(group, digest)
+
+
+def _version(group):
+    return shared_cache.get(VERSION_KEY.format(group), 0)
+
+
+def invalidate(group):
+    """
+    Once the current transaction commits, stop serving ``group``'s entries
+    and rebuild its targets in the background.
+    """
+    transaction.on_commit(lambda: _invalidate_now(group))
+
+
+def _invalidate_now(group):
+    key = VERSION_KEY.format(group)
+    try:
+        shared_cache.incr(key)
+    except ValueError:
+        shared_cache.add(key, 1, timeout=None)
+    # one warm-up per group at a time; entries it stores from before a later
+    # invalidation are simply invalid again and rebuilt on their next read
+    lock_key = GROUP_LOCK_KEY.format(group)
+    if shared_cache.add(lock_key, 1, timeout=LOCK_TIMEOUT):
+        get_pool().submit(_in_thread, _warm_locked, group, lock_key)
+
+
+def _warm_locked(group, lock_key):
+    try:
+        warm(group)
+    finally:
+        shared_cache.delete(lock_key)
+
+
+def _in_thread(func, *args):
+    close_old_connections()
+    try:
+        return func(*args)
+    finally:
+        close_old_connections()
+
+
+def _render(path, query, host, secure):
+    """Run the view for ``path`` with a cache-rebuilding GET request."""
+    request = RequestFactory().get(path, query, HTTP_HOST=host, secure=secure)
+    request.warm_cache_rebuild = True
+    match = resolve(path)
+    return match.func(request, *match.args, **match.kwargs)
+
+
+def _rebuild(path, query, host, secure, lock_key):
+    try:
+        _render(path, query, host, secure)
+    finally:
+        shared_cache.delete(lock_key)
+
+
+def warm(group):
+    """Rebuild every target of ``group`` now; returns the number rebuilt."""
+    backend = urlsplit(settings.BACKEND_URL or "")
+    for url_name, query in GROUPS[group]:
+        _render(
+            reverse(url_name),
+            query,
+            backend.netloc or "localhost",
+            backend.scheme == "https",
+        )
+    return len(GROUPS[group])
+
+
+def _store(key, group, version, data):
+    shared_cache.set(
+        key,
+        {
+            "version": version,
+            "fresh_until": time.time() + settings.WARM_CACHE_TIMEOUT,
+            "data": data,
+        },
+        timeout=settings.WARM_CACHE_TIMEOUT + settings.WARM_CACHE_STALE,
+    )
+
+
+class WarmCacheMixin:
+    """
+    Serve ``list`` from the group cache (see module docstring). Requests with
+    a query parameter the view does not read are answered uncached, so
+    made-up parameters cannot fill the cache with copies of one page.
+    """
+
+    cache_group = None
+    # query parameters read besides filters, pagination and field selection
+    cache_query_params = ()
+
+    def get_cache_query_params(self):
+        params = {"fields", "expand", *self.cache_query_params}
+        filterset_class = getattr(self, "filterset_class", None)
+        if filterset_class is not None:
+            params.update(filterset_class.base_filters)
+        for name in ("page_query_param", "page_size_query_param"):
+            params.add(getattr(self.paginator, name, None))
+        params.discard(None)
+        return params
+
+    def get_throttles(self):
+        # background rebuilds are not client requests
+        if getattr(self.request, "warm_cache_rebuild", False):
+            return []
+        return super().get_throttles()
+
+    def list(self, request, *args, **kwargs):
+        group = self.cache_group
+        key = _entry_key(group, request)
+        lock_key = LOCK_KEY.format(key)
+
+        def build():
+            version = _version(group)
+            response = super(WarmCacheMixin, self).list(request, *args, **kwargs)
+            if response.status_code == 200:
+                _store(key, group, version, response.data)
+            return response
+
+        if getattr(request, "warm_cache_rebuild", False):
+            return build()
+        if not set(request.GET).issubset(self.get_cache_query_params()):
+            return super().list(request, *args, **kwargs)
+
+        version_key = VERSION_KEY.format(group)
+        cached = shared_cache.get_many([key, version_key])
+        entry = cached.get(key)
+        if entry is not None and entry["version"] == cached.get(version_key, 0):
+            if entry["fresh_until"] < time.time():
+                # answer from the expired entry; one request schedules the rebuild
+                if shared_cache.add(lock_key, 1, timeout=LOCK_TIMEOUT):
+                    get_pool().submit(
+                        _in_thread,
+                        _rebuild,
+                        request.path,
+                        request.GET.copy(),
+                        request.get_host(),
+                        request.is_secure(),
+                        lock_key,
+                    )
+            return Response(entry["data"])
+        return build()
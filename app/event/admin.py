@@ -3,6 +3,7 @@ from django.contrib import admin
 from .models import (
     CampaignModel,
     CommentModel,
+    ContributionSession,
     EventModel,
     LocationModel,
     RegisterPeople,
@@ -14,3 +15,4 @@ admin.site.register(EventModel)
 admin.site.register(RegisterPeople)
 admin.site.register(CampaignModel)
 admin.site.register(CommentModel)
+admin.site.register(ContributionSession)
@@ -0,0 +1,243 @@
+"""
+Volunteering activity datasets for the reporting team.
+
+Each dataset is a ``values_list`` query whose hour columns are computed by
+the database; rows are read in chunks (server-side cursors on PostgreSQL)
+and written to CSV, gzip-compressed CSV, or Parquet when pyarrow is
+installed. Per-campaign and per-user hours are summed from the contribution
+ledger's rollups (ledger.py).
+"""
+
+import csv
+import gzip
+
+from django.db.models import Count, ExpressionWrapper, F, FloatField, Func, Sum
+
+from . import ledger
+from .models import CommentModel, RegisterPeople
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+
+class HoursBetween(Func):
+    """Hours elapsed from ``start`` to ``end``, computed in SQL."""
+
+    arg_joiner = " - "
+    template = "EXTRACT(EPOCH FROM (%(expressions)s)) / 3600.0"
+    output_field = FloatField()
+
+    def __init__(self, start, end, **extra):
+        super().__init__(end, start, **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            template="(julianday(%(expressions)s)) * 24.0",
+            arg_joiner=") - julianday(",
+            **extra_context,
+        )
+
+
+def contribution_hours():
+    """Hours of a contribution rolled up by the contribution ledger."""
+    return ExpressionWrapper(
+        F("volunteered_seconds") / 3600.0, output_field=FloatField()
+    )
+
+
+class Dataset:
+    def __init__(self, name, columns, build):
+        self.name = name
+        self.columns = columns
+        self._build = build
+
+    def queryset(self):
+        return self._build().values_list(*self.columns)
+
+    def rows(self, chunk_size=5000):
+        return self.queryset().iterator(chunk_size=chunk_size)
+
+
+def _contributions():
+    return CommentModel.objects.annotate(
+        campaign_title=F("campaign__title"),
+        urgency_level=F("campaign__urgency_level"),
+        full_name=F("user__full_name"),
+        city=F("user__profile__city"),
+        hours=contribution_hours(),
+    ).order_by("id")
+
+
+def _registrations():
+    return RegisterPeople.objects.annotate(
+        event_title=F("event__title"),
+        cause=F("event__category__name"),
+        location=F("event__location__name"),
+        full_name=F("user__full_name"),
+        city=F("user__profile__city"),
+        event_start=F("event__event_start"),
+        event_end=F("event__event_end"),
+        hours=HoursBetween("event__event_start", "event__event_end"),
+    ).order_by("registered_on")
+
+
+def _campaign_hours():
+    return (
+        CommentModel.objects.values("campaign_id")
+        .annotate(
+            title=F("campaign__title"),
+            urgency_level=F("campaign__urgency_level"),
+            contributors=Count("user", distinct=True),
+            hours=ledger.campaign_seconds("campaign_id") / 3600.0,
+        )
+        .order_by("campaign_id")
+    )
+
+
+def _user_hours():
+    return (
+        CommentModel.objects.filter(user__isnull=False)
+        .values("user_id")
+        .annotate(
+            full_name=F("user__full_name"),
+            city=F("user__profile__city"),
+            point_achieved=F("user__profile__point_achieved"),
+            campaigns=Count("campaign", distinct=True),
+            hours=ledger.user_seconds("user_id") / 3600.0,
+        )
+        .order_by("user_id")
+    )
+
+
+def _cause_hours():
+    return (
+        RegisterPeople.objects.filter(event__category__isnull=False)
+        .values(cause=F("event__category__name"))
+        .annotate(
+            events=Count("event", distinct=True),
+            volunteers=Count("user", distinct=True),
+            hours=Sum(HoursBetween("event__event_start", "event__event_end")),
+        )
+        .order_by("cause")
+    )
+
+
+DATASETS = {
+    dataset.name: dataset
+    for dataset in [
+        Dataset(
+            "contributions",
+            [
+                "id",
+                "campaign_id",
+                "campaign_title",
+                "urgency_level",
+                "user_id",
+                "full_name",
+                "city",
+                "option",
+                "created_at",
+                "end_at",
+                "hours",
+            ],
+            _contributions,
+        ),
+        Dataset(
+            "registrations",
+            [
+                "registed_id",
+                "event_id",
+                "event_title",
+                "cause",
+                "location",
+                "user_id",
+                "full_name",
+                "city",
+                "registered_on",
+                "event_start",
+                "event_end",
+                "hours",
+            ],
+            _registrations,
+        ),
+        Dataset(
+            "campaign_hours",
+            ["campaign_id", "title", "urgency_level", "contributors", "hours"],
+            _campaign_hours,
+        ),
+        Dataset(
+            "user_hours",
+            ["user_id", "full_name", "city", "point_achieved", "campaigns", "hours"],
+            _user_hours,
+        ),
+        Dataset(
+            "cause_hours",
+            ["cause", "events", "volunteers", "hours"],
+            _cause_hours,
+        ),
+    ]
+}
+
+
+def write_csv(dataset, fileobj, chunk_size=5000):
+    writer = csv.writer(fileobj)
+    writer.writerow(dataset.columns)
+    count = 0
+    for row in dataset.rows(chunk_size):
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_csv_gz(dataset, path, chunk_size=5000):
+    with gzip.open(path, "wt", newline="") as fileobj:
+        return write_csv(dataset, fileobj, chunk_size)
+
+
+def write_parquet(dataset, path, chunk_size=5000):
+    """Write ``dataset`` as Parquet one record batch per chunk."""
+    count = 0
+    writer = None
+    chunk = []
+
+    def flush():
+        nonlocal writer
+        table = pyarrow.Table.from_pylist(
+            [dict(zip(dataset.columns, row)) for row in chunk]
+        )
+        if writer is None:
+            writer = pyarrow.parquet.ParquetWriter(path, table.schema)
+        writer.write_table(table)
+        chunk.clear()
+
+    try:
+        for row in dataset.rows(chunk_size):
+            chunk.append(row)
+            count += 1
+            if len(chunk) >= chunk_size:
+                flush()
+        if chunk or writer is None:
+            flush()
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+class Echo:
+    """File-like object whose ``write`` returns the value, for streaming CSV."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(dataset, chunk_size=5000):
+    writer = csv.writer(Echo())
+    yield writer.writerow(dataset.columns)
+    for row in dataset.rows(chunk_size):
+        yield writer.writerow(row)
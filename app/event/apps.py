@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EventConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app.event"
+
+    def ready(self):
+        import app.event.warm
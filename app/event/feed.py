@@ -0,0 +1,52 @@
+"""
+Cause-based activity feed.
+
+New campaigns and contributions are fanned out to the followers of the
+campaign's cause (``ProfileCauses``): one row per follower for small
+audiences (push), or a single shared row that followers merge in at read
+time when the audience is larger than ``FEED_PUSH_LIMIT`` (pull).
+"""
+
+from django.conf import settings
+from django.db.models import Q
+
+from app.user.models import ProfileCauses
+
+from .models import FeedEntry
+
+
+def fan_out(kind, campaign, actor):
+    if campaign.cause_id is None:
+        return
+    # Profile's primary key is its user id
+    followers = ProfileCauses.objects.filter(cause_id=campaign.cause_id).exclude(
+        profile_id=actor.pk
+    )
+    entry = {
+        "cause_id": campaign.cause_id,
+        "kind": kind,
+        "campaign": campaign,
+        "actor": actor,
+    }
+    if followers.count() > settings.FEED_PUSH_LIMIT:
+        FeedEntry.objects.create(user=None, **entry)
+        return
+    FeedEntry.objects.bulk_create(
+        [
+            FeedEntry(user_id=user_id, **entry)
+            for user_id in followers.values_list("profile_id", flat=True)
+        ],
+        batch_size=1000,
+    )
+
+
+def feed_for(user_id):
+    """Pushed entries for ``user_id`` merged with pulled entries of their causes."""
+    causes = ProfileCauses.objects.filter(profile_id=user_id).values("cause_id")
+    return (
+        FeedEntry.objects.filter(
+            Q(user_id=user_id) | Q(user__isnull=True, cause__in=causes)
+        )
+        .exclude(actor_id=user_id)
+        .select_related("campaign", "cause")
+    )
@@ -0,0 +1,104 @@
+import uuid
+from datetime import timedelta
+
+from django.db.models import Count
+from django.utils import timezone
+
+from api.explain import hot_query
+
+from . import stats
+from .models import CommentModel, EventModel, RegisterPeople
+
+# placeholder keys: plans depend on the query shape, not on the values
+USER_ID = "0"
+EVENT_ID = uuid.UUID(int=0)
+
+
+@hot_query("contribution_for_user_and_campaign")
+def contribution_for_user_and_campaign():
+    # CommentViewSet.create
+    return CommentModel.objects.filter(user_id=USER_ID, campaign_id=1)
+
+
+@hot_query("contributions_for_user")
+def contributions_for_user():
+    # VolunteerHistory, CommentViewSet.list(?user_id=)
+    return CommentModel.objects.filter(user_id=USER_ID)
+
+
+@hot_query("active_contributions_for_campaign")
+def active_contributions_for_campaign():
+    # campaign_live_stream snapshot for ?campaign= (accrual reads the open
+    # ContributionSession rows instead, see ledger.roll_up_open_sessions)
+    return CommentModel.objects.filter(campaign_id__in=[1], option="Started")
+
+
+@hot_query("active_contributors_per_campaign")
+def active_contributors_per_campaign():
+    # campaign_live_stream snapshot
+    return (
+        CommentModel.objects.filter(option="Started")
+        .values("campaign")
+        .annotate(active=Count("id"))
+    )
+
+
+@hot_query("latest_contributions")
+def latest_contributions():
+    return CommentModel.objects.order_by("-created_at")[:100]
+
+
+@hot_query("registration_for_user_and_event")
+def registration_for_user_and_event():
+    # EventRegister
+    return RegisterPeople.objects.filter(event_id=EVENT_ID, user_id=USER_ID)
+
+
+@hot_query("registrations_for_event")
+def registrations_for_event():
+    return RegisterPeople.objects.filter(event_id=EVENT_ID)
+
+
+def available():
+    return EventModel.status_filter(EventModel.UPCOMING, EventModel.ONGOING)
+
+
+@hot_query("available_events_by_category")
+def available_events_by_category():
+    # EventFilter ?category=&is_available=true
+    return EventModel.objects.filter(available(), category_id=1)
+
+
+@hot_query("available_events_by_location")
+def available_events_by_location():
+    # EventFilter ?location=&is_available=true
+    return EventModel.objects.filter(available(), location_id=1)
+
+
+@hot_query("events_to_start")
+def events_to_start():
+    # sweep_event_status
+    return EventModel.objects.filter(
+        status=EventModel.UPCOMING, event_start__lte=timezone.now()
+    )
+
+
+@hot_query("events_to_finish")
+def events_to_finish():
+    # sweep_event_status
+    return EventModel.objects.filter(
+        status__in=[EventModel.UPCOMING, EventModel.ONGOING],
+        event_end__lt=timezone.now(),
+    )
+
+
+@hot_query("daily_contributions_for_campaign")
+def daily_contributions_for_campaign():
+    today = timezone.localdate()
+    return stats.window_rows(today - timedelta(days=29), today, campaign_id=1)
+
+
+@hot_query("daily_contributions")
+def daily_contributions():
+    today = timezone.localdate()
+    return stats.window_rows(today - timedelta(days=29), today)
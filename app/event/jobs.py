@@ -0,0 +1,34 @@
+from django.utils import timezone
+
+from api import warmup
+from api.scheduler import job
+from . import ledger
+from .models import EventModel
+
+
+@job(cron="*/5 * * * *")
+def accrue_volunteer_points():
+    """
+    Roll running contribution sessions up to now, crediting points for each
+    whole hour as it completes, then refresh the warm-cached campaign list.
+    """
+    ledger.roll_up_open_sessions()
+    warmup.invalidate("campaigns")
+
+
+@job(cron="* * * * *")
+def sweep_event_status():
+    """
+    Move events whose end has passed to finished and those whose start has
+    passed to ongoing, reading only unfinished rows through the partial
+    indexes on event_start/event_end.
+    """
+    now = timezone.now()
+    finished = EventModel.objects.filter(
+        status__in=[EventModel.UPCOMING, EventModel.ONGOING], event_end__lt=now
+    ).update(status=EventModel.FINISHED)
+    started = EventModel.objects.filter(
+        status=EventModel.UPCOMING, event_start__lte=now
+    ).update(status=EventModel.ONGOING)
+    if finished or started:
+        warmup.invalidate("events")
@@ -0,0 +1,200 @@
+"""
+Contribution ledger.
+
+Every start/stop of a contribution (``CommentModel``) is a
+``ContributionSession`` row. Time is rolled up incrementally: when a session
+stops, and every few minutes for running ones (``accrue_volunteer_points``),
+the time since the session's ``rolled_up_until`` is added to
+
+* the contribution's ``volunteered_seconds``, crediting each new whole hour
+  to ``total_volunteered`` and ``POINTS_PER_HOUR`` points to the user,
+* ``HourlyContribution`` per campaign and UTC hour,
+* ``DailyContribution`` per campaign, user and local day,
+
+so hour totals are read from these rows instead of recomputed from
+timestamps. Restarting a contribution opens a new session; earlier ones keep
+their history.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, FloatField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from app.user.models import Profile
+
+from .models import (
+    CommentModel,
+    ContributionSession,
+    DailyContribution,
+    HourlyContribution,
+    whole_hours,
+)
+
+POINTS_PER_HOUR = 5
+
+
+def split_hours(start, end):
+    """``[(hour, seconds)]`` of ``start``-``end`` split at UTC hour boundaries."""
+    pieces = []
+    hour = start.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+    while hour < end:
+        next_hour = hour + timedelta(hours=1)
+        seconds = (min(end, next_hour) - max(start, hour)).total_seconds()
+        if seconds > 0:
+            pieces.append((hour, seconds))
+        hour = next_hour
+    return pieces
+
+
+def _add_seconds(model, key, seconds):
+    if model.objects.filter(**key).update(seconds=F("seconds") + seconds):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(seconds=seconds, **key)
+    except IntegrityError:
+        # created concurrently since the update above
+        model.objects.filter(**key).update(seconds=F("seconds") + seconds)
+
+
+def roll_up(session, until, close=False):
+    """
+    Add ``session``'s time from ``rolled_up_until`` to ``until`` to its
+    contribution and the rollups, closing the session at ``until`` if
+    ``close``. Returns the whole hours newly credited.
+    """
+    contribution = session.contribution
+    start = session.rolled_up_until
+    until = max(until, start)
+    changes = {"rolled_up_until": until}
+    if close:
+        changes["ended_at"] = until
+    with transaction.atomic():
+        # claims the interval: a concurrent roll-up of the same session
+        # matches no row and adds nothing
+        if not ContributionSession.objects.filter(
+            pk=session.pk, rolled_up_until=start, ended_at__isnull=True
+        ).update(**changes):
+            return 0
+        pieces = split_hours(start, until)
+        daily = defaultdict(float)
+        for hour, seconds in pieces:
+            _add_seconds(
+                HourlyContribution,
+                {"campaign_id": contribution.campaign_id, "hour": hour},
+                seconds,
+            )
+            daily[timezone.localdate(hour)] += seconds
+        for day, seconds in daily.items():
+            _add_seconds(
+                DailyContribution,
+                {
+                    "campaign_id": contribution.campaign_id,
+                    "user_id": contribution.user_id,
+                    "day": day,
+                },
+                seconds,
+            )
+        rows = CommentModel.objects.filter(pk=contribution.pk)
+        rows.update(
+            volunteered_seconds=F("volunteered_seconds")
+            + sum(seconds for _, seconds in pieces)
+        )
+        total, credited = rows.values_list(
+            "volunteered_seconds", "total_volunteered"
+        ).get()
+        hours = max(whole_hours(total) - credited, 0)
+        if hours:
+            rows.update(total_volunteered=F("total_volunteered") + hours)
+            Profile.objects.filter(user_id=contribution.user_id).update(
+                point_achieved=Coalesce("point_achieved", Value(0))
+                + hours * POINTS_PER_HOUR
+            )
+    for name, value in changes.items():
+        setattr(session, name, value)
+    return hours
+
+
+def start_session(contribution, now=None):
+    now = now or timezone.now()
+    if contribution.sessions.filter(ended_at__isnull=True).exists():
+        return
+    try:
+        with transaction.atomic():
+            ContributionSession.objects.create(
+                contribution=contribution, started_at=now, rolled_up_until=now
+            )
+    except IntegrityError:
+        # opened concurrently since the check above
+        # (session_one_open_per_contribution)
+        pass
+
+
+def stop_session(contribution, now=None):
+    """Close the running session; returns the whole hours newly credited."""
+    session = contribution.sessions.filter(ended_at__isnull=True).first()
+    if session is None:
+        return 0
+    session.contribution = contribution
+    return roll_up(session, now or timezone.now(), close=True)
+
+
+def roll_up_open_sessions(now=None):
+    """Roll every running session up to ``now``; returns the hours credited."""
+    now = now or timezone.now()
+    open_sessions = ContributionSession.objects.filter(
+        ended_at__isnull=True
+    ).select_related("contribution")
+    return sum(roll_up(session, now) for session in open_sessions.iterator())
+
+
+def _seconds(model, **filters):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**filters)
+            .order_by()
+            .values(*filters)
+            .annotate(total=Sum("seconds"))
+            .values("total")
+        ),
+        Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def campaign_seconds(outer="pk"):
+    """Seconds volunteered on the campaign ``outer`` refers to, as an expression."""
+    return _seconds(HourlyContribution, campaign=OuterRef(outer))
+
+
+def user_seconds(outer="pk"):
+    """Seconds volunteered by the user ``outer`` refers to, as an expression."""
+    return _seconds(DailyContribution, user=OuterRef(outer))
+
+
+def open_since():
+    """
+    Where the running session of a contribution was last rolled up to, as an
+    expression; None once it is stopped.
+    """
+    return Subquery(
+        ContributionSession.objects.filter(
+            contribution=OuterRef("pk"), ended_at__isnull=True
+        ).values("rolled_up_until")[:1]
+    )
+
+
+def campaign_hours(campaign_ids):
+    """``{campaign_id: whole hours volunteered}``, from the hourly rollups."""
+    totals = (
+        HourlyContribution.objects.filter(campaign__in=campaign_ids)
+        .values_list("campaign_id")
+        .annotate(seconds=Sum("seconds"))
+        .order_by()
+    )
+    return {campaign_id: whole_hours(seconds) for campaign_id, seconds in totals}
@@ -0,0 +1,118 @@
+"""
+Live contribution updates pushed to clients over Server-Sent Events.
+
+``CommentViewSet.create`` publishes a message for every start/stop/restart;
+``campaign_live_stream`` (ASGI only) forwards them to connected clients.
+``InProcessBroker`` delivers within one worker; ``CacheBroker`` goes through
+the shared cache so every worker's subscribers see every message.
+"""
+
+import asyncio
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from api.cache import shared_cache
+
+
+class InProcessBroker:
+    """Pub/sub between threads and event loops of the current process."""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def publish(self, message):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, message)
+
+    async def subscribe(self, keepalive):
+        """Yield published messages, or ``None`` after ``keepalive`` idle seconds."""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers.add(subscriber)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber[1].get(), keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
+
+
+class CacheBroker:
+    """
+    Multi-worker stand-in for a real broker: messages are numbered with a
+    counter in the shared cache and kept there briefly; subscribers poll the
+    counter and read the messages they have not seen yet. Needs Redis: the
+    numbering relies on an atomic incr, and every subscriber polls.
+    """
+
+    sequence_key = "live_events_seq"
+    message_key = "live_event_{}"
+    message_timeout = 60
+    poll_interval = 0.5
+    max_backlog = 500
+
+    def __init__(self):
+        if not isinstance(caches["shared"], RedisCache):
+            raise ImproperlyConfigured("CacheBroker needs a Redis shared cache")
+
+    def publish(self, message):
+        try:
+            sequence = shared_cache.incr(self.sequence_key)
+        except ValueError:
+            shared_cache.add(self.sequence_key, 0, timeout=None)
+            sequence = shared_cache.incr(self.sequence_key)
+        shared_cache.set(
+            self.message_key.format(sequence), message, timeout=self.message_timeout
+        )
+
+    async def subscribe(self, keepalive):
+        last = await shared_cache.aget(self.sequence_key, 0)
+        idle = 0.0
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            sequence = await shared_cache.aget(self.sequence_key, 0)
+            if sequence <= last:
+                idle += self.poll_interval
+                if idle >= keepalive:
+                    idle = 0.0
+                    yield None
+                continue
+            first = max(last + 1, sequence - self.max_backlog + 1)
+            keys = [self.message_key.format(n) for n in range(first, sequence + 1)]
+            messages = await shared_cache.aget_many(keys)
+            for key in keys:
+                if key in messages:
+                    yield messages[key]
+            last = sequence
+            idle = 0.0
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        _broker = import_string(settings.LIVE_EVENTS_BROKER)()
+    return _broker
+
+
+def publish_contribution(campaign_id, active_delta, hours_delta=0):
+    get_broker().publish(
+        {
+            "campaign": campaign_id,
+            "active_delta": active_delta,
+            "hours_delta": hours_delta,
+        }
+    )
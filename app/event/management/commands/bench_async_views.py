@@ -0,0 +1,97 @@
+import asyncio
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client
+from rest_framework.views import APIView
+
+# (sync DRF endpoint, async counterpart)
+ENDPOINTS = [
+    ("/api/v1/events/", "/api/v1/async/events/"),
+    ("/api/v1/campaigns/", "/api/v1/async/campaigns/"),
+    ("/api/v1/event/location/", "/api/v1/async/event/location/"),
+    ("/api/v1/skills/list/", "/api/v1/async/skills/list/"),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-tests the sync read endpoints against their async versions. "
+        "By default both run in-process (sync views on a thread pool, async "
+        "views on one event loop); pass --wsgi-url/--asgi-url to load running "
+        "servers instead, e.g. gunicorn _backend.wsgi:app vs "
+        "uvicorn _backend.asgi:application."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument("--wsgi-url")
+        parser.add_argument("--asgi-url")
+
+    def run_threads(self, fetch, path, requests, concurrency):
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            statuses = list(pool.map(lambda _: fetch(path), range(requests)))
+        return statuses, time.monotonic() - started
+
+    def run_async(self, path, requests, concurrency):
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                return (await client.get(path)).status_code
+
+        async def run():
+            started = time.monotonic()
+            statuses = await asyncio.gather(*(one() for _ in range(requests)))
+            return statuses, time.monotonic() - started
+
+        return asyncio.run(run())
+
+    def report(self, label, path, statuses, elapsed):
+        ok = sum(1 for status in statuses if status == 200)
+        self.stdout.write(
+            f"{label:<6}{path:<36}{len(statuses) / elapsed:>9.1f} req/s"
+            f"  ({ok}/{len(statuses)} ok)"
+        )
+
+    def handle(self, *args, **options):
+        requests, concurrency = options["requests"], options["concurrency"]
+        wsgi_url, asgi_url = options["wsgi_url"], options["asgi_url"]
+
+        def fetch_url(base):
+            def fetch(path):
+                try:
+                    with urllib.request.urlopen(base.rstrip("/") + path) as response:
+                        response.read()
+                        return response.status
+                except urllib.error.HTTPError as e:
+                    return e.code
+
+            return fetch
+
+        def fetch_client(path):
+            return Client().get(path).status_code
+
+        # in-process runs would otherwise be cut off by the anon rate limit
+        with mock.patch.object(APIView, "get_throttles", return_value=[]):
+            for sync_path, async_path in ENDPOINTS:
+                fetch = fetch_url(wsgi_url) if wsgi_url else fetch_client
+                self.report(
+                    "sync",
+                    sync_path,
+                    *self.run_threads(fetch, sync_path, requests, concurrency),
+                )
+                if asgi_url:
+                    result = self.run_threads(
+                        fetch_url(asgi_url), async_path, requests, concurrency
+                    )
+                else:
+                    result = self.run_async(async_path, requests, concurrency)
+                self.report("async", async_path, *result)
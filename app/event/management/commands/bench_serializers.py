@@ -0,0 +1,94 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONRenderer, orjson
+from app.event.models import CommentModel, EventModel
+from app.event.serializers import (
+    CampaignSerializer,
+    CommentSerializer,
+    EventSerializer,
+    FastCampaignSerializer,
+    FastCommentSerializer,
+    FastEventSerializer,
+)
+from app.event.views import CampaignViewSet
+
+# (name, queryset as the list view builds it, serializer, fast serializer)
+TARGETS = [
+    (
+        "campaigns",
+        lambda: CampaignViewSet.queryset.select_related("creator").prefetch_related(
+            "comments__user"
+        ),
+        CampaignSerializer,
+        FastCampaignSerializer,
+    ),
+    (
+        "events",
+        lambda: EventModel.objects.prefetch_related("registered_people", "skills_required"),
+        EventSerializer,
+        FastEventSerializer,
+    ),
+    (
+        "comments",
+        lambda: CommentModel.objects.select_related("campaign", "user"),
+        CommentSerializer,
+        FastCommentSerializer,
+    ),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares rows per second of the DRF serializers + JSONRenderer with "
+        "the values() fast path + FastJSONRenderer on the list endpoints' "
+        "querysets, and checks both produce the same JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100, help="rows per run")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def time_runs(self, render, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            output = render()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return output, best
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        self.stdout.write(f"orjson: {'yes' if orjson else 'no (pure-Python fallback)'}")
+        self.stdout.write(
+            f"{'endpoint':<12}{'rows':>6}{'drf rows/s':>14}{'fast rows/s':>14}"
+            f"{'speedup':>10}  same output"
+        )
+        for name, queryset, serializer_class, fast_class in TARGETS:
+            fast = fast_class()
+            drf_output, drf_time = self.time_runs(
+                lambda: JSONRenderer().render(
+                    serializer_class(queryset()[:rows], many=True).data
+                ),
+                repeat,
+            )
+            fast_output, fast_time = self.time_runs(
+                lambda: FastJSONRenderer().render(
+                    fast.serialize(fast.rows(queryset())[:rows])
+                ),
+                repeat,
+            )
+            count = len(json.loads(drf_output))
+            if not count:
+                self.stdout.write(f"{name:<12}{0:>6}  (no rows to serialize)")
+                continue
+            same = json.loads(drf_output) == json.loads(fast_output)
+            self.stdout.write(
+                f"{name:<12}{count:>6}{count / drf_time:>14.0f}"
+                f"{count / fast_time:>14.0f}{drf_time / fast_time:>9.1f}x"
+                f"  {'yes' if same else 'NO'}"
+            )
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.ids import uuid7_from_datetime
+from app.event.models import EventModel
+
+
+class Command(BaseCommand):
+    help = (
+        "Rewrites existing random (v4) event ids to time-ordered v7 ids derived "
+        "from created_at, together with every foreign key and join table row "
+        "pointing at them, one batch per transaction. Old event URLs stop "
+        "resolving afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def referencing_fields(self):
+        """(model, attname) of every FK to EventModel, M2M through tables included."""
+        return [
+            (relation.related_model, relation.field.attname)
+            for relation in EventModel._meta.get_fields(include_hidden=True)
+            if (relation.one_to_many or relation.one_to_one) and relation.auto_created
+        ]
+
+    @transaction.atomic
+    def rewrite(self, batch, references):
+        for old_id, created_at in batch:
+            new_id = uuid7_from_datetime(created_at)
+            # FK constraints are deferred, so children can follow after the parent
+            EventModel.objects.filter(event_id=old_id).update(event_id=new_id)
+            for model, attname in references:
+                model._base_manager.filter(**{attname: old_id}).update(
+                    **{attname: new_id}
+                )
+
+    def handle(self, *args, **options):
+        references = self.referencing_fields()
+        columns = [f"{model._meta.db_table}.{name}" for model, name in references]
+        self.stdout.write(f"Referencing columns: {', '.join(columns)}")
+        pending = [
+            (event_id, created_at)
+            for event_id, created_at in EventModel.objects.order_by(
+                "created_at"
+            ).values_list("event_id", "created_at")
+            if event_id.version != 7
+        ]
+        self.stdout.write(f"{len(pending)} events to rewrite")
+        if options["dry_run"]:
+            return
+
+        size = options["batch_size"]
+        for start in range(0, len(pending), size):
+            self.rewrite(pending[start : start + size], references)
+            self.stdout.write(f"  {min(start + size, len(pending))}/{len(pending)}")
+        self.stdout.write(self.style.SUCCESS(f"Rewrote {len(pending)} event ids"))
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-19 18:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0002_initial'),
+        ('user', '0002_password_reset_token'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campaignmodel',
+            name='cause',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='campaigns', to='user.causeschoicesmodel'),
+        ),
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('campaign', 'New campaign'), ('contribution', 'New contribution')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('actor', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='event.campaignmodel')),
+                ('cause', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='user.causeschoicesmodel')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-id'], name='feed_user_id_idx'), models.Index(condition=models.Q(('user__isnull', True)), fields=['cause', '-id'], name='feed_pull_cause_id_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+from django.db import migrations
+from django.db.models import Count, Min, Sum
+
+
+def merge_duplicate_rows(apps, schema_editor):
+    """
+    Prepares for the unique (user, campaign) and (event, user) constraints.
+    Views always updated the lowest id of a duplicated contribution, so that
+    row is kept with the summed hours; the earliest registration is kept.
+    """
+    CommentModel = apps.get_model("event", "CommentModel")
+    duplicates = (
+        CommentModel.objects.filter(user__isnull=False)
+        .values("user", "campaign")
+        .annotate(rows=Count("id"), keep=Min("id"), hours=Sum("total_volunteered"))
+        .filter(rows__gt=1)
+    )
+    for pair in duplicates:
+        rows = CommentModel.objects.filter(user=pair["user"], campaign=pair["campaign"])
+        rows.filter(id=pair["keep"]).update(total_volunteered=pair["hours"])
+        rows.exclude(id=pair["keep"]).delete()
+
+    RegisterPeople = apps.get_model("event", "RegisterPeople")
+    duplicates = (
+        RegisterPeople.objects.filter(user__isnull=False)
+        .values("event", "user")
+        .annotate(rows=Count("registed_id"))
+        .filter(rows__gt=1)
+    )
+    for pair in duplicates:
+        rows = RegisterPeople.objects.filter(event=pair["event"], user=pair["user"])
+        keep = (
+            rows.order_by("registered_on", "registed_id")
+            .values_list("registed_id", flat=True)
+            .first()
+        )
+        rows.exclude(registed_id=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0003_campaign_cause_feed_entry"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_rows, migrations.RunPython.noop),
+    ]
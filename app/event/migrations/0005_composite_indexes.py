@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-19 18:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0004_merge_duplicate_contributions'),
+        ('user', '0002_password_reset_token'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='commentmodel',
+            index=models.Index(condition=models.Q(('option', 'Started')), fields=['campaign'], name='comment_active_campaign_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='commentmodel',
+            index=models.Index(fields=['-created_at'], name='comment_created_desc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventmodel',
+            index=models.Index(fields=['category', 'event_end'], name='event_category_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventmodel',
+            index=models.Index(fields=['location', 'event_end'], name='event_location_end_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='commentmodel',
+            constraint=models.UniqueConstraint(fields=('user', 'campaign'), name='comment_user_campaign_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='registerpeople',
+            constraint=models.UniqueConstraint(fields=('event', 'user'), name='register_event_user_uniq'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-19 18:58
+
+import app.event.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0005_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='eventmodel',
+            name='event_id',
+            field=models.UUIDField(default=app.event.models.new_event_id, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-19 19:01
+
+import api.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0006_event_id_uuid7'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='registerpeople',
+            name='registed_id',
+            field=models.CharField(default=api.ids.sortable_id, editable=False, max_length=30, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.7 on 2026-10-19 19:20
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def set_event_status(apps, schema_editor):
+    """Backfill status the way EventModel.status_at computes it."""
+    EventModel = apps.get_model("event", "EventModel")
+    now = timezone.now()
+    EventModel.objects.filter(event_end__lt=now).update(status="finished")
+    EventModel.objects.filter(status="upcoming", event_start__lte=now).update(
+        status="ongoing"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0007_sortable_registration_id'),
+        ('user', '0003_sequential_user_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='eventmodel',
+            name='event_category_end_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='eventmodel',
+            name='event_location_end_idx',
+        ),
+        migrations.AddField(
+            model_name='eventmodel',
+            name='status',
+            field=models.CharField(choices=[('upcoming', 'Upcoming'), ('ongoing', 'Ongoing'), ('finished', 'Finished')], default='upcoming', editable=False, max_length=10),
+        ),
+        migrations.RunPython(set_event_status, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='eventmodel',
+            index=models.Index(fields=['category', 'status'], name='event_category_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventmodel',
+            index=models.Index(fields=['location', 'status'], name='event_location_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventmodel',
+            index=models.Index(condition=models.Q(('status', 'upcoming')), fields=['event_start'], name='event_upcoming_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventmodel',
+            index=models.Index(condition=models.Q(('status__in', ['upcoming', 'ongoing'])), fields=['event_end'], name='event_unfinished_end_idx'),
+        ),
+    ]
@@ -0,0 +1,134 @@
+# Generated by Django 5.1.7 on 2026-10-19 19:24
+
+from collections import defaultdict
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def split_hours(start, end):
+    """
+    ``[(hour, seconds)]`` of ``start``-``end`` split at UTC hour boundaries.
+    A copy of ``app.event.ledger.split_hours`` as of this migration.
+    """
+    pieces = []
+    hour = start.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+    while hour < end:
+        next_hour = hour + timedelta(hours=1)
+        seconds = (min(end, next_hour) - max(start, hour)).total_seconds()
+        if seconds > 0:
+            pieces.append((hour, seconds))
+        hour = next_hour
+    return pieces
+
+
+def open_ledger(apps, schema_editor):
+    """
+    One session per existing contribution, rolled up to its stop (or now, if
+    running). Hours already credited to points are not credited again.
+    """
+    CommentModel = apps.get_model("event", "CommentModel")
+    ContributionSession = apps.get_model("event", "ContributionSession")
+    HourlyContribution = apps.get_model("event", "HourlyContribution")
+    DailyContribution = apps.get_model("event", "DailyContribution")
+    now = timezone.now()
+    sessions, hourly, daily = [], defaultdict(float), defaultdict(float)
+    for comment in CommentModel.objects.iterator():
+        stopped = comment.option == "Stop" and comment.end_at is not None
+        until = max(comment.end_at if stopped else now, comment.created_at)
+        sessions.append(
+            ContributionSession(
+                contribution_id=comment.pk,
+                started_at=comment.created_at,
+                ended_at=until if stopped else None,
+                rolled_up_until=until,
+            )
+        )
+        pieces = split_hours(comment.created_at, until)
+        for hour, seconds in pieces:
+            day = timezone.localdate(hour)
+            hourly[comment.campaign_id, hour] += seconds
+            daily[comment.campaign_id, comment.user_id, day] += seconds
+        seconds = sum(seconds for _, seconds in pieces)
+        CommentModel.objects.filter(pk=comment.pk).update(
+            volunteered_seconds=seconds,
+            total_volunteered=max(comment.total_volunteered, int(seconds // 3600)),
+        )
+    ContributionSession.objects.bulk_create(sessions, batch_size=1000)
+    HourlyContribution.objects.bulk_create(
+        [
+            HourlyContribution(campaign_id=campaign_id, hour=hour, seconds=seconds)
+            for (campaign_id, hour), seconds in hourly.items()
+        ],
+        batch_size=1000,
+    )
+    DailyContribution.objects.bulk_create(
+        [
+            DailyContribution(
+                campaign_id=campaign_id, user_id=user_id, day=day, seconds=seconds
+            )
+            for (campaign_id, user_id, day), seconds in daily.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0008_event_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='commentmodel',
+            name='volunteered_seconds',
+            field=models.FloatField(default=0),
+        ),
+        migrations.CreateModel(
+            name='ContributionSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField()),
+                ('ended_at', models.DateTimeField(blank=True, null=True)),
+                ('rolled_up_until', models.DateTimeField()),
+                ('contribution', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sessions', to='event.commentmodel')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('ended_at__isnull', True)), fields=['rolled_up_until'], name='session_open_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('ended_at__isnull', True)), fields=('contribution',), name='session_one_open_per_contribution')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyContribution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('seconds', models.FloatField(default=0)),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='event.campaignmodel')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'day'], name='daily_user_day_idx'), models.Index(fields=['day'], name='daily_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('campaign', 'user', 'day'), name='daily_campaign_user_day_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='HourlyContribution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('seconds', models.FloatField(default=0)),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='event.campaignmodel')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('campaign', 'hour'), name='hourly_campaign_hour_uniq')],
+            },
+        ),
+        migrations.RunPython(open_ledger, migrations.RunPython.noop),
+    ]
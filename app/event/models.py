@@ -1,13 +1,54 @@
 import math
+import operator
 import uuid
+from datetime import timedelta
+from functools import reduce
 
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
-from shortuuid.django_fields import ShortUUIDField
 
+from api.ids import sortable_id, uuid7
 from app.user import models as user_model
 
 
+def hours_between(start, end):
+    """Whole hours from ``start`` to ``end``, as shown in the API."""
+    return math.floor((end - start).total_seconds() / 3600)
+
+
+def whole_hours(seconds):
+    """Whole hours in ``seconds`` added up by the contribution ledger."""
+    # sums of microsecond-resolution floats: three hours can add up to 10799.99..
+    return math.floor(round(seconds, 6) / 3600)
+
+
+def contribution_hours(volunteered_seconds, open_since, now=None):
+    """
+    Whole hours of a contribution: its rolled-up seconds, plus the time since
+    ``open_since`` while a session is running.
+    """
+    seconds = volunteered_seconds
+    if open_since is not None:
+        running = (now or timezone.now()) - open_since
+        seconds += max(running, timedelta()).total_seconds()
+    return whole_hours(seconds)
+
+
+def event_status(event_start, event_end, now):
+    if event_end is not None and event_end < now:
+        return EventModel.FINISHED
+    if event_start <= now:
+        return EventModel.ONGOING
+    return EventModel.UPCOMING
+
+
+def new_event_id():
+    if settings.EVENT_ID_VERSION == 7:
+        return uuid7()
+    return uuid.uuid4()
+
+
 # Create your models here.
 class LocationModel(models.Model):
     name = models.CharField(max_length=100)
@@ -17,6 +58,13 @@ class LocationModel(models.Model):
 
 
 class EventModel(models.Model):
+    UPCOMING, ONGOING, FINISHED = "upcoming", "ongoing", "finished"
+    STATUSES = [
+        (UPCOMING, "Upcoming"),
+        (ONGOING, "Ongoing"),
+        (FINISHED, "Finished"),
+    ]
+
     title = models.CharField(max_length=255, db_index=True)
     created_by = models.ForeignKey(
         user_model.User,
@@ -38,18 +86,72 @@ class EventModel(models.Model):
     )
     skills_required = models.ManyToManyField(user_model.SkillsModel)
     private = models.BooleanField(default=False)
-    event_id = models.UUIDField(
-        default=uuid.uuid4, unique=True, primary_key=True, editable=False, db_index=True
-    )
+    event_id = models.UUIDField(default=new_event_id, primary_key=True, editable=False)
     event_start = models.DateTimeField(db_index=True)
     event_end = models.DateTimeField(db_index=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # set by save() and moved on at event_start/event_end by the
+    # sweep_event_status job; an event without an end never finishes. Reads
+    # go through current_status() and status_filter(), which stay right when
+    # the job is not running.
+    status = models.CharField(
+        max_length=10, choices=STATUSES, default=UPCOMING, editable=False
+    )
+
+    class Meta:
+        indexes = [
+            # EventFilter: ?category= / ?location= combined with ?is_available=
+            models.Index(
+                fields=["category", "status"], name="event_category_status_idx"
+            ),
+            models.Index(
+                fields=["location", "status"], name="event_location_status_idx"
+            ),
+            # sweep_event_status: the next events to start and to finish
+            models.Index(
+                fields=["event_start"],
+                name="event_upcoming_start_idx",
+                condition=models.Q(status="upcoming"),
+            ),
+            models.Index(
+                fields=["event_end"],
+                name="event_unfinished_end_idx",
+                condition=models.Q(status__in=["upcoming", "ongoing"]),
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.status = self.status_at(timezone.now())
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "status"}
+        super().save(*args, **kwargs)
+
+    def status_at(self, now):
+        return event_status(self.event_start, self.event_end, now)
+
+    def current_status(self):
+        return self.status_at(timezone.now())
+
     def is_available(self):
-        return self.event_end >= timezone.now()
+        return self.current_status() != self.FINISHED
+
+    @classmethod
+    def status_filter(cls, *statuses, now=None):
+        """``Q`` of the events whose status is one of ``statuses`` at ``now``."""
+        now = now or timezone.now()
+        running = models.Q(event_end__isnull=True) | models.Q(event_end__gte=now)
+        started = models.Q(event_start__lte=now)
+        # the stored status lags behind the clock, never runs ahead of it
+        unfinished = models.Q(status__in=[cls.UPCOMING, cls.ONGOING])
+        conditions = {
+            cls.UPCOMING: models.Q(status=cls.UPCOMING) & ~started,
+            cls.ONGOING: unfinished & started & running,
+            cls.FINISHED: models.Q(status=cls.FINISHED) | ~running,
+        }
+        return reduce(operator.or_, (conditions[status] for status in statuses))
 
     def registered_people(self):
         return RegisterPeople.objects.filter(event=self)
@@ -66,14 +168,18 @@ class RegisterPeople(models.Model):
         blank=True,
     )
     registered_status = models.BooleanField(default=False)
-    registed_id = ShortUUIDField(
-        length=15,
-        max_length=30,
-        alphabet="abcdefghijklmnopqrstuvwxyz0123456789",
-        primary_key=True,
+    registed_id = models.CharField(
+        max_length=30, primary_key=True, default=sortable_id, editable=False
     )
     registered_on = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "user"], name="register_event_user_uniq"
+            ),
+        ]
+
     def __str__(self):
         return f"{self.user.full_name} registered for {self.event.title} on {self.registed_id} "
 
@@ -95,6 +201,13 @@ class CampaignModel(models.Model):
     urgency_level = models.CharField(
         max_length=10, choices=URGENCY_LEVELS, default="Low", db_index=True
     )
+    cause = models.ForeignKey(
+        user_model.CausesChoicesModel,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="campaigns",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -104,12 +217,16 @@ class CampaignModel(models.Model):
         return self.comments.count()
 
     def total_time_from_start(self):
-        elapsed_time = timezone.now() - self.created_at
-        return math.floor(elapsed_time.total_seconds() / 3600)
+        return hours_between(self.created_at, timezone.now())
 
     def total_volunteered_time(self):
-        contributes = CommentModel.objects.filter(campaign=self)
-        return sum(contribute.total_time() for contribute in contributes)
+        # list views annotate volunteered_seconds (ledger.campaign_seconds)
+        seconds = getattr(self, "volunteered_seconds", None)
+        if seconds is None:
+            seconds = HourlyContribution.objects.filter(campaign=self).aggregate(
+                seconds=models.Sum("seconds")
+            )["seconds"]
+        return whole_hours(seconds or 0)
 
 
 class CommentModel(models.Model):
@@ -119,16 +236,170 @@ class CommentModel(models.Model):
     )
     user = models.ForeignKey(user_model.User, on_delete=models.SET_NULL, null=True)
     option = models.TextField(max_length=20, choices=status)
+    # whole hours credited to the user's points so far
     total_volunteered = models.PositiveIntegerField(default=0)
+    # time rolled up from the contribution's sessions (see ledger.py)
+    volunteered_seconds = models.FloatField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     end_at = models.DateTimeField(default=None, null=True, blank=True)
 
+    class Meta:
+        constraints = [
+            # one contribution row per user and campaign, restarted in place
+            models.UniqueConstraint(
+                fields=["user", "campaign"], name="comment_user_campaign_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["campaign"],
+                name="comment_active_campaign_idx",
+                condition=models.Q(option="Started"),
+            ),
+            models.Index(fields=["-created_at"], name="comment_created_desc_idx"),
+        ]
+
     def __str__(self):
         return f"Contributed by {self.user.full_name} on {self.campaign} "
 
     def total_time(self):
-        if self.end_at is not None and self.option == "Stop":
-            elapsed_time = self.end_at - self.created_at
+        """
+        Whole hours volunteered, a running session counted up to now (the
+        hours credited to points so far are ``total_volunteered``).
+        """
+        if hasattr(self, "open_since"):
+            # annotated by the list views (ledger.open_since)
+            since = self.open_since
         else:
-            elapsed_time = timezone.now() - self.created_at
-        return math.floor(elapsed_time.total_seconds() / 3600)
+            since = (
+                self.sessions.filter(ended_at__isnull=True)
+                .values_list("rolled_up_until", flat=True)
+                .first()
+            )
+        return contribution_hours(self.volunteered_seconds, since)
+
+
+class ContributionSession(models.Model):
+    """
+    One start/stop interval of a contribution. Time up to ``rolled_up_until``
+    has been added to the contribution and the hourly/daily rollups; a closed
+    session is never changed again (see ledger.py).
+    """
+
+    contribution = models.ForeignKey(
+        CommentModel, on_delete=models.CASCADE, related_name="sessions"
+    )
+    started_at = models.DateTimeField()
+    ended_at = models.DateTimeField(null=True, blank=True)
+    rolled_up_until = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["contribution"],
+                name="session_one_open_per_contribution",
+                condition=models.Q(ended_at__isnull=True),
+            ),
+        ]
+        indexes = [
+            # accrue_volunteer_points: every running session
+            models.Index(
+                fields=["rolled_up_until"],
+                name="session_open_idx",
+                condition=models.Q(ended_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.contribution_id}: {self.started_at} - {self.ended_at}"
+
+
+class HourlyContribution(models.Model):
+    """Seconds volunteered on a campaign in each clock hour (UTC)."""
+
+    campaign = models.ForeignKey(
+        CampaignModel, on_delete=models.CASCADE, related_name="+"
+    )
+    hour = models.DateTimeField()
+    seconds = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["campaign", "hour"], name="hourly_campaign_hour_uniq"
+            ),
+        ]
+
+
+class DailyContribution(models.Model):
+    """Seconds volunteered per campaign, user and local day."""
+
+    campaign = models.ForeignKey(
+        CampaignModel, on_delete=models.CASCADE, related_name="+"
+    )
+    user = models.ForeignKey(
+        user_model.User, on_delete=models.SET_NULL, null=True, related_name="+"
+    )
+    day = models.DateField()
+    seconds = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["campaign", "user", "day"], name="daily_campaign_user_day_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["user", "day"], name="daily_user_day_idx"),
+            models.Index(fields=["day"], name="daily_day_idx"),
+        ]
+
+
+class FeedEntry(models.Model):
+    """
+    Activity feed item for followers of a cause. Entries with a ``user`` were
+    pushed to that follower; entries without one were written once for a
+    cause with too many followers and are pulled by them at read time.
+    """
+
+    KINDS = [
+        ("campaign", "New campaign"),
+        ("contribution", "New contribution"),
+    ]
+
+    user = models.ForeignKey(
+        user_model.User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="feed_entries",
+    )
+    cause = models.ForeignKey(
+        user_model.CausesChoicesModel,
+        on_delete=models.CASCADE,
+        related_name="feed_entries",
+    )
+    kind = models.CharField(max_length=20, choices=KINDS)
+    campaign = models.ForeignKey(
+        CampaignModel, on_delete=models.CASCADE, related_name="feed_entries"
+    )
+    actor = models.ForeignKey(
+        user_model.User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-id"], name="feed_user_id_idx"),
+            models.Index(
+                fields=["cause", "-id"],
+                name="feed_pull_cause_id_idx",
+                condition=models.Q(user__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} on {self.campaign_id} for {self.user_id or self.cause}"
@@ -1,13 +1,26 @@
+from collections import defaultdict
+from operator import itemgetter
+
+from django.db.models import Count
+from django.utils import timezone
 from rest_framework import serializers
 
+from api.fastpath import FastSerializer
+from api.fieldsets import SparseFieldsMixin
+from app.user.models import User
 from app.user.serializers import UserSerializer
 
+from . import ledger
 from .models import (
     CampaignModel,
     CommentModel,
     EventModel,
+    FeedEntry,
     LocationModel,
     RegisterPeople,
+    contribution_hours,
+    event_status,
+    hours_between,
 )
 
 
@@ -23,8 +36,17 @@ class RegisterSerializer(serializers.ModelSerializer):
         fields = ["user"]
 
 
-class EventSerializer(serializers.ModelSerializer):
+class RegistrationExportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RegisterPeople
+        fields = ["registed_id", "event", "user", "registered_status", "registered_on"]
+
+
+class EventSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     registered_people = RegisterSerializer(many=True, required=False)
+    status = serializers.ChoiceField(
+        EventModel.STATUSES, source="current_status", read_only=True
+    )
 
     class Meta:
         model = EventModel
@@ -42,6 +64,7 @@ class EventSerializer(serializers.ModelSerializer):
             "event_end",
             "created_at",
             "is_available",
+            "status",
             "registered_people",
         ]
 
@@ -49,13 +72,13 @@ class EventSerializer(serializers.ModelSerializer):
 """"Campaign serializer"""
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = CommentModel
         fields = ["id", "option", "created_at", "campaign", "user", "total_time"]
 
 
-class CampaignSerializer(serializers.ModelSerializer):
+class CampaignSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     creator = UserSerializer()
 
     class Meta:
@@ -67,6 +90,7 @@ class CampaignSerializer(serializers.ModelSerializer):
             "body",
             "image",
             "urgency_level",
+            "cause",
             "created_at",
             "total_comments",
             "total_time_from_start",
@@ -88,3 +112,109 @@ class HistroySerializer(serializers.ModelSerializer):
     class Meta:
         model = CommentModel
         fields = ["campaign", "option", "created_at", "total_time"]
+
+
+class FeedEntrySerializer(serializers.ModelSerializer):
+    cause_name = serializers.CharField(source="cause.name", read_only=True)
+    campaign_title = serializers.CharField(source="campaign.title", read_only=True)
+
+    class Meta:
+        model = FeedEntry
+        fields = [
+            "id",
+            "kind",
+            "cause",
+            "cause_name",
+            "campaign",
+            "campaign_title",
+            "actor",
+            "created_at",
+        ]
+
+
+"""Fast paths for the list endpoints (see api/fastpath.py)"""
+
+
+def current_status(row):
+    return event_status(row["event_start"], row["event_end"], timezone.now())
+
+
+def is_available(row):
+    return current_status(row) != EventModel.FINISHED
+
+
+class FastEventSerializer(FastSerializer):
+    serializer_class = EventSerializer
+    computed = {
+        "skills_required": (["event_id"], itemgetter("skill_ids")),
+        "is_available": (["event_start", "event_end"], is_available),
+        "status": (["event_start", "event_end"], current_status),
+        "registered_people": (["event_id"], itemgetter("registrations")),
+    }
+    collapsed = {"registered_people": (["event_id"], itemgetter("registrations"))}
+
+    def attach(self, rows):
+        skills, registrations = defaultdict(list), defaultdict(list)
+        event_ids = [row.get("event_id") for row in rows]
+        if self.selection.selects("skills_required"):
+            for event_id, skill_id in (
+                EventModel.skills_required.through.objects.filter(
+                    eventmodel__in=event_ids
+                )
+                .order_by("skillsmodel_id")
+                .values_list("eventmodel_id", "skillsmodel_id")
+            ):
+                skills[event_id].append(skill_id)
+        if self.selection.selects("registered_people"):
+            expand = self.selection.expands("registered_people")
+            for event_id, user_id, registed_id in (
+                RegisterPeople.objects.filter(event__in=event_ids)
+                .order_by("registed_id")
+                .values_list("event_id", "user_id", "registed_id")
+            ):
+                registrations[event_id].append(
+                    {"user": user_id} if expand else registed_id
+                )
+        for row in rows:
+            row["skill_ids"] = skills[row.get("event_id")]
+            row["registrations"] = registrations[row.get("event_id")]
+
+
+def total_time(row):
+    return contribution_hours(row["volunteered_seconds"], row["open_since"])
+
+
+class FastCommentSerializer(FastSerializer):
+    serializer_class = CommentSerializer
+    annotations = {"open_since": ledger.open_since()}
+    computed = {"total_time": (["volunteered_seconds", "open_since"], total_time)}
+
+
+def total_time_from_start(row):
+    return hours_between(row["created_at"], timezone.now())
+
+
+class FastCampaignSerializer(FastSerializer):
+    serializer_class = CampaignSerializer
+    annotations = {"comment_count": Count("comments")}
+    computed = {
+        "creator": (["creator"], itemgetter("creator_data")),
+        "total_comments": (["comment_count"], itemgetter("comment_count")),
+        "total_time_from_start": (["created_at"], total_time_from_start),
+        "total_volunteered_time": (["id"], itemgetter("volunteered_hours")),
+    }
+
+    def attach(self, rows):
+        users, hours = {}, {}
+        if self.includes("creator"):
+            # each creator is serialized once per page, however many campaigns
+            creators = User.objects.filter(pk__in={row["creator"] for row in rows})
+            users = {
+                user["user_id"]: user
+                for user in UserSerializer(creators, many=True).data
+            }
+        if self.selection.selects("total_volunteered_time"):
+            hours = ledger.campaign_hours([row["id"] for row in rows])
+        for row in rows:
+            row["creator_data"] = users.get(row.get("creator"))
+            row["volunteered_hours"] = hours.get(row.get("id"), 0)
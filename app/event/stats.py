@@ -0,0 +1,133 @@
+"""
+Contribution statistics for the organisers' charts.
+
+Series are read from the contribution ledger's ``DailyContribution`` rollups
+(see ledger.py), never from the contributions themselves: each endpoint
+reads the rows of the ``?days=`` window ending today in a single query and
+sums its series and totals from them, with missing days filled in as
+zeros. Responses are cached per campaign, window and day for
+``STATS_CACHE_TIMEOUT`` seconds, about as often as the rollups move.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .models import DailyContribution
+
+CACHE_KEY = "contribution_stats:{}:{}:{}"
+
+
+def window_days(request):
+    """The ``?days=`` window, ``STATS_DEFAULT_DAYS`` when not given."""
+    value = request.query_params.get("days", settings.STATS_DEFAULT_DAYS)
+    try:
+        days = int(value)
+    except (TypeError, ValueError):
+        days = 0
+    if not 1 <= days <= settings.STATS_MAX_DAYS:
+        raise ValidationError(
+            {"days": f"Must be a number from 1 to {settings.STATS_MAX_DAYS}."}
+        )
+    return days
+
+
+def _hours(seconds):
+    return round((seconds or 0) / 3600, 2)
+
+
+def _bucket():
+    return {"seconds": 0.0, "contributors": set(), "campaigns": set()}
+
+
+def _add(bucket, user_id, campaign_id, seconds):
+    bucket["seconds"] += seconds
+    if user_id is not None:
+        bucket["contributors"].add(user_id)
+    bucket["campaigns"].add(campaign_id)
+
+
+def _figures(bucket, counts):
+    figures = {"hours": _hours(bucket["seconds"])}
+    figures.update((name, len(bucket[name])) for name in counts)
+    return figures
+
+
+def _daily(buckets, start, end, counts):
+    """One point per day from ``start`` to ``end``, zeros where no row."""
+    series, day = [], start
+    while day <= end:
+        point = {"day": day}
+        point.update(_figures(buckets.get(day) or _bucket(), counts))
+        series.append(point)
+        day += timedelta(days=1)
+    return series
+
+
+def _cached(scope, days, build):
+    end = timezone.localdate()
+    key = CACHE_KEY.format(scope, days, end)
+    data = cache.get(key)
+    if data is None:
+        data = build(end - timedelta(days=days - 1), end)
+        cache.set(key, data, timeout=settings.STATS_CACHE_TIMEOUT)
+    return data
+
+
+def window_rows(start, end, **filters):
+    """
+    ``(day, user_id, campaign_id, urgency_level, seconds)`` of every rollup
+    row in the window; the series and totals are all summed from these.
+    """
+    return DailyContribution.objects.filter(
+        day__range=(start, end), **filters
+    ).values_list("day", "user_id", "campaign_id", "campaign__urgency_level", "seconds")
+
+
+def campaign_stats(campaign_id, days):
+    """Hours and contributors per day of one campaign."""
+
+    def build(start, end):
+        totals, daily = _bucket(), defaultdict(_bucket)
+        rows = window_rows(start, end, campaign_id=campaign_id)
+        for day, user_id, _, _, seconds in rows:
+            for bucket in (totals, daily[day]):
+                _add(bucket, user_id, campaign_id, seconds)
+        return {
+            "campaign": campaign_id,
+            "start": start,
+            "end": end,
+            "totals": _figures(totals, ["contributors"]),
+            "daily": _daily(daily, start, end, ["contributors"]),
+        }
+
+    return _cached(campaign_id, days, build)
+
+
+def global_stats(days):
+    """Hours, contributors and active campaigns per day, and per urgency level."""
+
+    def build(start, end):
+        totals, daily, urgency = _bucket(), defaultdict(_bucket), defaultdict(_bucket)
+        for day, user_id, campaign_id, level, seconds in window_rows(start, end):
+            for bucket in (totals, daily[day], urgency[level]):
+                _add(bucket, user_id, campaign_id, seconds)
+        return {
+            "start": start,
+            "end": end,
+            "totals": _figures(totals, ["contributors"]),
+            "daily": _daily(daily, start, end, ["contributors", "campaigns"]),
+            "urgency": [
+                {
+                    "urgency_level": level,
+                    **_figures(urgency[level], ["contributors", "campaigns"]),
+                }
+                for level in sorted(urgency)
+            ],
+        }
+
+    return _cached("all", days, build)
@@ -1,3 +1,154 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.cache import shared_cache
+from app.user.models import CausesChoicesModel, Profile, SkillsModel, User
+
+from . import ledger
+from .models import (
+    CampaignModel,
+    CommentModel,
+    DailyContribution,
+    EventModel,
+    HourlyContribution,
+    LocationModel,
+)
+
+
+def make_user(name):
+    return User.objects.create_user(
+        username=name, email=f"{name}@example.com", password="pw-12345!"
+    )
+
+
+class RollUpTests(TestCase):
+    def setUp(self):
+        self.user = make_user("volunteer")
+        self.campaign = CampaignModel.objects.create(
+            creator=self.user, title="Campaign", body="Body"
+        )
+        self.comment = CommentModel.objects.create(
+            campaign=self.campaign, user=self.user, option="Started"
+        )
+        self.start = timezone.now() - timedelta(hours=2, minutes=30)
+        ledger.start_session(self.comment, self.start)
+        self.session = self.comment.sessions.get()
+
+    def test_rolls_up_each_interval_once(self):
+        until = self.start + timedelta(hours=1, minutes=10)
+        self.assertEqual(ledger.roll_up(self.session, until), 1)
+        stale = self.comment.sessions.get()
+        stale.rolled_up_until = self.start
+        # a second roll-up of the same interval claims nothing
+        self.assertEqual(ledger.roll_up(stale, until), 0)
+
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.volunteered_seconds, 70 * 60)
+        self.assertEqual(self.comment.total_volunteered, 1)
+        self.assertEqual(Profile.objects.get(user=self.user).point_achieved, 5)
+        self.assertEqual(
+            sum(HourlyContribution.objects.values_list("seconds", flat=True)),
+            70 * 60,
+        )
+        self.assertEqual(
+            sum(DailyContribution.objects.values_list("seconds", flat=True)),
+            70 * 60,
+        )
+
+    def test_total_time_counts_the_running_session(self):
+        ledger.roll_up(self.session, self.start + timedelta(hours=1, minutes=10))
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.total_time(), 2)
+        hours = ledger.campaign_hours([self.campaign.pk])
+        self.assertEqual(hours, {self.campaign.pk: 1})
+
+        credited = ledger.stop_session(self.comment, self.start + timedelta(hours=3))
+        self.assertEqual(credited, 2)
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.total_time(), 3)
+        self.assertEqual(self.comment.total_volunteered, 3)
+        hours = ledger.campaign_hours([self.campaign.pk])
+        self.assertEqual(hours, {self.campaign.pk: 3})
+        self.assertEqual(self.campaign.total_volunteered_time(), 3)
+
+
+class EventStatusTests(TestCase):
+    def test_status_is_computed_when_read(self):
+        now = timezone.now()
+        for title, start, end in [
+            ("upcoming", now + timedelta(hours=1), now + timedelta(hours=2)),
+            ("ongoing", now - timedelta(hours=1), None),
+            ("finished", now - timedelta(hours=3), now - timedelta(hours=2)),
+        ]:
+            EventModel.objects.create(
+                title=title, description="", event_start=start, event_end=end
+            )
+        # as if the scheduler had not run since the events were created
+        EventModel.objects.update(status=EventModel.UPCOMING)
+
+        for event in EventModel.objects.all():
+            self.assertEqual(event.current_status(), event.title)
+        for status, _ in EventModel.STATUSES:
+            titles = EventModel.objects.filter(EventModel.status_filter(status))
+            self.assertEqual(list(titles.values_list("title", flat=True)), [status])
+
+
+class FastListTests(TestCase):
+    """The fast list serializers answer exactly as the DRF serializers do."""
+
+    def setUp(self):
+        now = timezone.now()
+        creator = make_user("creator")
+        volunteer = make_user("volunteer")
+        cause = CausesChoicesModel.objects.create(name="Environment")
+        skill = SkillsModel.objects.create(name="First aid")
+        location = LocationModel.objects.create(name="Park")
+        for hours in (-3, 1):
+            event = EventModel.objects.create(
+                title=f"Event {hours}",
+                description="",
+                created_by=creator,
+                category=cause,
+                location=location,
+                event_start=now + timedelta(hours=hours),
+                event_end=now + timedelta(hours=hours + 1),
+            )
+            event.skills_required.add(skill)
+        # the list is ordered by urgency only
+        campaign = CampaignModel.objects.create(
+            creator=creator, title="Campaign", body="Body", cause=cause
+        )
+        CampaignModel.objects.create(
+            creator=volunteer, title="Empty", body="Body", urgency_level="Urgent"
+        )
+        for user in (creator, volunteer):
+            comment = CommentModel.objects.create(
+                campaign=campaign, user=user, option="Started"
+            )
+            ledger.start_session(comment, now - timedelta(hours=2, minutes=30))
+        ledger.roll_up_open_sessions(now - timedelta(hours=1))
+        ledger.stop_session(comment, now - timedelta(minutes=30))
+
+    def get(self, path, fast):
+        # list responses are cached across both paths
+        shared_cache.clear()
+        with override_settings(FAST_LIST_SERIALIZERS=fast):
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def assertSameOutput(self, path):
+        self.assertEqual(self.get(path, fast=True), self.get(path, fast=False))
+
+    def test_events(self):
+        self.assertSameOutput("/api/v1/events/")
+        self.assertSameOutput("/api/v1/events/?fields=title,status,is_available")
+
+    def test_campaigns(self):
+        self.assertSameOutput("/api/v1/campaigns/")
+        self.assertSameOutput("/api/v1/campaigns/?fields=id,total_volunteered_time")
+
+    def test_comments(self):
+        self.assertSameOutput("/api/v1/comments/")
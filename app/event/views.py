@@ -1,10 +1,14 @@
+import json
 from datetime import datetime
 
 import django_filters
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
 from django.db import transaction
-from django.db.models import Case, IntegerField, Value, When
-from django.http import HttpResponse
+from django.db.models import Case, Count, IntegerField, Value, When
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
@@ -12,10 +16,18 @@ from reportlab.lib.pagesizes import A4, landscape
 from reportlab.pdfgen import canvas
 from rest_framework import generics, pagination, permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 
-from app.user.models import Profile, User
+from api.asynchronous import AsyncListView, AsyncRetrieveView
+from api.db_routers import ReplicaReadMixin
+from api.fastpath import FastListMixin
+from api.fieldsets import FieldSelectionMixin
+from api.streaming import NDJSONExportMixin
+from api.warmup import WarmCacheMixin
+from app.user.models import CausesChoicesModel, Profile, User
 
+from . import analytics, feed, ledger, live, stats
 from .models import (
     CampaignModel,
     CommentModel,
@@ -27,14 +39,20 @@ from .serializers import (
     CampaignSerializer,
     CommentSerializer,
     EventSerializer,
+    FastCampaignSerializer,
+    FastCommentSerializer,
+    FastEventSerializer,
+    FeedEntrySerializer,
     HistroySerializer,
     LocationSerializer,
+    RegistrationExportSerializer,
     RegisterSerializer,
 )
 
 
 # Location API
-class LocationApiView(generics.ListAPIView):
+class LocationApiView(WarmCacheMixin, generics.ListAPIView):
+    cache_group = "locations"
     queryset = LocationModel.objects.all()
     serializer_class = LocationSerializer
 
@@ -42,27 +60,45 @@ class LocationApiView(generics.ListAPIView):
 # Filtering for Events
 class EventFilter(django_filters.FilterSet):
     is_available = django_filters.BooleanFilter(method="filter_is_available")
+    status = django_filters.ChoiceFilter(
+        choices=EventModel.STATUSES, method="filter_status"
+    )
 
     class Meta:
         model = EventModel
-        fields = ["location", "category"]
+        fields = ["location", "category", "status"]
 
     def filter_is_available(self, queryset, name, value):
-        now = timezone.now()
-        return (
-            queryset.filter(event_end__gte=now)
-            if value
-            else queryset.filter(event_end__lt=now)
-        )
+        if value:
+            return queryset.filter(
+                EventModel.status_filter(EventModel.UPCOMING, EventModel.ONGOING)
+            )
+        return queryset.filter(EventModel.status_filter(EventModel.FINISHED))
+
+    def filter_status(self, queryset, name, value):
+        return queryset.filter(EventModel.status_filter(value))
 
 
 # Event View API
-class EventViewAPI(viewsets.ModelViewSet):
+class EventViewAPI(
+    ReplicaReadMixin, WarmCacheMixin, FastListMixin, viewsets.ModelViewSet
+):
+    cache_group = "events"
     queryset = EventModel.objects.all()
     serializer_class = EventSerializer
+    fast_serializer_class = FastEventSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_class = EventFilter
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        selection = self.get_field_selection()
+        if selection.selects("registered_people"):
+            queryset = queryset.prefetch_related("registered_people")
+        if selection.selects("skills_required"):
+            queryset = queryset.prefetch_related("skills_required")
+        return queryset
+
     def get_permissions(self):
         if self.action in ["list", "retrieve"]:
             return [permissions.AllowAny()]
@@ -89,23 +125,42 @@ urgency_order = Case(
 )
 
 
+def campaign_relations(queryset, selection):
+    """
+    Load only the relations the selected fields read (api/fieldsets.py);
+    shared by the DRF and async campaign views.
+    """
+    if selection.includes("creator"):
+        queryset = queryset.select_related("creator")
+    if selection.selects("total_comments"):
+        queryset = queryset.prefetch_related("comments")
+    if selection.selects("total_volunteered_time"):
+        queryset = queryset.annotate(volunteered_seconds=ledger.campaign_seconds())
+    return queryset
+
+
 # Campaign ViewSet
-class CampaignViewSet(viewsets.ModelViewSet):
+class CampaignViewSet(
+    ReplicaReadMixin, WarmCacheMixin, FastListMixin, viewsets.ModelViewSet
+):
     """
     API EndPoint for Campaign Model
     """
 
-    queryset = (
-        CampaignModel.objects.annotate(urgency_order=urgency_order)
-        .select_related("creator")
-        .prefetch_related("comments__user")
-        .order_by("urgency_order")
+    cache_group = "campaigns"
+    queryset = CampaignModel.objects.annotate(urgency_order=urgency_order).order_by(
+        "urgency_order"
     )
     serializer_class = CampaignSerializer
+    fast_serializer_class = FastCampaignSerializer
     pagination_class = CampaignPagination
+    replica_actions = ("list", "retrieve", "stats")
+
+    def get_queryset(self):
+        return campaign_relations(super().get_queryset(), self.get_field_selection())
 
     def get_permissions(self):
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "stats"]:
             return [permissions.AllowAny()]
         return [permissions.IsAuthenticated()]
 
@@ -117,7 +172,8 @@ class CampaignViewSet(viewsets.ModelViewSet):
             "title":"title",
             "body":"details",
             "image":"url_field(optional)",
-            "level": "Low / Medium / Urgent"
+            "level": "Low / Medium / Urgent",
+            "cause": "cause_id(optional)"
         }
         This post request will create a new campaign post.
         """
@@ -127,6 +183,7 @@ class CampaignViewSet(viewsets.ModelViewSet):
         body = request.data.get("body")
         image = request.data.get("image")
         level = request.data.get("level")
+        cause_id = request.data.get("cause")
 
         if not all([user_id, title, body, level]):
             return Response(
@@ -134,6 +191,17 @@ class CampaignViewSet(viewsets.ModelViewSet):
             )
 
         user = get_object_or_404(User, user_id=user_id)
+        if cause_id not in (None, ""):
+            try:
+                cause_id = int(cause_id)
+            except (TypeError, ValueError):
+                return Response(
+                    {"error": "cause must be a cause id"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            cause_id = get_object_or_404(CausesChoicesModel, pk=cause_id).pk
+        else:
+            cause_id = None
 
         campaign = CampaignModel.objects.create(
             creator=user,
@@ -141,53 +209,13 @@ class CampaignViewSet(viewsets.ModelViewSet):
             body=body,
             image=image,
             urgency_level=level,
+            cause_id=cause_id,
         )
-        # Clear cache:
-        cache.delete("campaigns_list")
+        transaction.on_commit(lambda: feed.fan_out("campaign", campaign, user))
         return Response(
             {"message": "Campaign created successfully"}, status=status.HTTP_201_CREATED
         )
 
-    def list(self, request, *args, **kwargs):
-        """Update volunteer points whenever campaigns are fetched and cache the results."""
-
-        cache_key = "campaigns_list"
-        cached_data = cache.get(cache_key)
-
-        if cached_data:
-            return Response(cached_data)
-
-        print("Fetching from DB and updating volunteer points...")
-
-        queryset = self.get_queryset()
-
-        profiles_to_update = []
-        comments_to_update = []
-
-        for campaign in queryset:
-            active_comments = campaign.comments.filter(option="Started").select_related(
-                "user"
-            )
-
-            for comment in active_comments:
-                elapsed_time = timezone.now() - comment.created_at
-                total_hours = divmod(elapsed_time.total_seconds(), 3600)[0]
-                reward = total_hours * 5
-
-                comment.user.profile.point_achieved = reward
-                profiles_to_update.append(comment.user.profile)
-
-                comment.end_at = timezone.now()
-                comments_to_update.append(comment)
-
-        Profile.objects.bulk_update(profiles_to_update, ["point_achieved"])
-        CommentModel.objects.bulk_update(comments_to_update, ["end_at"])
-
-        response = super().list(request, *args, **kwargs)
-
-        cache.set(cache_key, response.data, timeout=600)
-        return response
-
     @action(detail=False, methods=["get"], url_path="urgent")
     def urgent_campaigns(self, request):
         """Get all urgent campaigns"""
@@ -195,9 +223,17 @@ class CampaignViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(urgent_campaigns, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=["get"], url_path="stats")
+    def stats(self, request, pk=None):
+        """Hours and contributors per day over the last ``?days=`` (default 30)"""
+        campaign = get_object_or_404(CampaignModel.objects.only("id"), pk=pk)
+        return Response(stats.campaign_stats(campaign.id, stats.window_days(request)))
+
 
 # Comment ViewSet
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ReplicaReadMixin, FieldSelectionMixin, NDJSONExportMixin, viewsets.ModelViewSet
+):
     """
     To create volunteer model through comment u need to pass:
     {
@@ -205,27 +241,39 @@ class CommentViewSet(viewsets.ModelViewSet):
         "option": "Started / Stop",
         "campaign": "campaign_id"
     }
+    All comments (or one user's with ?user_id=) can be streamed as NDJSON
+    from /comments/export/.
     """
 
-    queryset = CommentModel.objects.all().order_by("-created_at")
+    queryset = CommentModel.objects.annotate(open_since=ledger.open_since()).order_by(
+        "-created_at"
+    )
     serializer_class = CommentSerializer
+    export_filename = "comments.ndjson"
 
     def get_permissions(self):
         if self.action in ["list", "retrieve"]:
             return [permissions.AllowAny()]
+        if self.action == "export":
+            return [permissions.IsAdminUser()]
         return [permissions.IsAuthenticated()]
 
-    def list(self, request, *args, **kwargs):
-        user_id = request.query_params.get("user_id")
+    def get_comments(self):
+        comments = CommentModel.objects.annotate(open_since=ledger.open_since())
+        user_id = self.request.query_params.get("user_id")
         if user_id:
             user = get_object_or_404(User, user_id=user_id)
-            comments = CommentModel.objects.filter(user=user).select_related(
-                "campaign", "user"
-            )
-        else:
-            comments = CommentModel.objects.all().select_related("campaign", "user")
+            return comments.filter(user=user).select_related("campaign", "user")
+        return comments.select_related("campaign", "user")
 
-        serializer = self.get_serializer(comments, many=True)
+    def get_export_queryset(self):
+        return self.get_comments()
+
+    def list(self, request, *args, **kwargs):
+        if settings.FAST_LIST_SERIALIZERS:
+            fast = FastCommentSerializer(self.get_field_selection())
+            return Response(fast.serialize(fast.rows(self.get_comments())))
+        serializer = self.get_serializer(self.get_comments(), many=True)
         return Response(serializer.data)
 
     @transaction.atomic
@@ -237,14 +285,19 @@ class CommentViewSet(viewsets.ModelViewSet):
         user = get_object_or_404(User, user_id=user_id)
         campaign = get_object_or_404(CampaignModel, id=campaign_id)
 
-        # Get existing comment or create a new one
-        comment = CommentModel.objects.filter(user=user, campaign=campaign).first()
+        # Get existing comment or create a new one. The row stays locked until
+        # commit, so concurrent submits for it run one after the other; a
+        # concurrent first submit finds the row the other one inserted.
+        comment, created = CommentModel.objects.select_for_update().get_or_create(
+            user=user, campaign=campaign, defaults={"option": "Started"}
+        )
 
-        if not comment:
-            comment = CommentModel.objects.create(
-                user=user, campaign=campaign, option="Started"
+        if created:
+            ledger.start_session(comment)
+            transaction.on_commit(
+                lambda: feed.fan_out("contribution", campaign, user)
             )
-            cache.delete("campaigns_list")  # Clear cache since new data is added
+            transaction.on_commit(lambda: live.publish_contribution(campaign.id, 1))
             cache.delete("comments_list")
             return Response(
                 {"message": "Contribution started successfully", "id": comment.id},
@@ -253,20 +306,17 @@ class CommentViewSet(viewsets.ModelViewSet):
 
         # Handling Stop action
         if option == "Stop" and comment.option == "Started":
-            elapsed_time = timezone.now() - comment.created_at
-            total_hours = divmod(elapsed_time.total_seconds(), 3600)[0]
-            reward = total_hours * 5
-
-            user.profile.point_achieved += reward
-            user.profile.save()
+            now = timezone.now()
+            # credits the user's points for each new whole hour
+            total_hours = ledger.stop_session(comment, now)
 
             comment.option = "Stop"
-            comment.total_volunteered += total_hours
-            comment.end_at = timezone.now()
-            print(comment)
-            comment.save()
+            comment.end_at = now
+            comment.save(update_fields=["option", "end_at"])
+            transaction.on_commit(
+                lambda: live.publish_contribution(campaign.id, -1, total_hours)
+            )
 
-            cache.delete("campaigns_list")
             cache.delete("comments_list")
             return Response(
                 {"message": "Contribution stopped successfully"},
@@ -277,10 +327,10 @@ class CommentViewSet(viewsets.ModelViewSet):
         if option == "Started" and comment.option == "Stop":
             comment.option = "Started"
             comment.end_at = None
-            print(comment)
-            comment.save()
+            comment.save(update_fields=["option", "end_at"])
+            ledger.start_session(comment)
+            transaction.on_commit(lambda: live.publish_contribution(campaign.id, 1))
 
-            cache.delete("campaigns_list")
             cache.delete("comments_list")
             return Response(
                 {"message": "Contribution restarted successfully"},
@@ -293,6 +343,99 @@ class CommentViewSet(viewsets.ModelViewSet):
         )
 
 
+# Live contribution counters (Server-Sent Events, ASGI only)
+async def campaign_live_stream(request):
+    """
+    Streams "N people volunteering now" updates. Sends a "snapshot" event with
+    the active contributors per campaign, then one "contribution" event per
+    start/stop with {"campaign", "active_delta", "hours_delta"}.
+    Optional ?campaign=<id>&campaign=<id> limits the stream to those campaigns.
+    """
+    if not isinstance(request, ASGIRequest):
+        # WSGI consumes a streaming response to the end before sending it,
+        # and this one never ends
+        return JsonResponse(
+            {"error": "The live stream is only served by the ASGI app."},
+            status=status.HTTP_501_NOT_IMPLEMENTED,
+        )
+    campaign_ids = {int(pk) for pk in request.GET.getlist("campaign") if pk.isdigit()}
+    active = CommentModel.objects.filter(option="Started")
+    if campaign_ids:
+        active = active.filter(campaign_id__in=campaign_ids)
+    snapshot = {
+        row["campaign"]: row["active"]
+        async for row in active.values("campaign").annotate(active=Count("id"))
+    }
+
+    async def events():
+        yield f"retry: 3000\nevent: snapshot\ndata: {json.dumps(snapshot)}\n\n"
+        async for message in live.get_broker().subscribe(
+            keepalive=settings.LIVE_EVENTS_KEEPALIVE
+        ):
+            if message is None:
+                yield ": keepalive\n\n"
+            elif not campaign_ids or message["campaign"] in campaign_ids:
+                yield f"event: contribution\ndata: {json.dumps(message)}\n\n"
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+# Async (ASGI) read-only endpoints: /async/...
+class AsyncEventList(AsyncListView):
+    serializer_class = EventSerializer
+
+    def get_queryset(self):
+        return EventModel.objects.prefetch_related(
+            "registered_people", "skills_required"
+        )
+
+    async def filter_queryset(self, queryset):
+        return await sync_to_async(
+            lambda: EventFilter(self.request.GET, queryset=queryset).qs
+        )()
+
+
+class AsyncEventDetail(AsyncRetrieveView):
+    serializer_class = EventSerializer
+    lookup_field = "event_id"
+
+    def get_queryset(self):
+        return EventModel.objects.prefetch_related(
+            "registered_people", "skills_required"
+        )
+
+
+class AsyncCampaignList(AsyncListView):
+    serializer_class = CampaignSerializer
+    serialize_in_thread = True
+    page_size = CampaignPagination.page_size
+
+    def get_queryset(self):
+        return campaign_relations(
+            CampaignViewSet.queryset.all(), self.get_field_selection()
+        )
+
+
+class AsyncCampaignDetail(AsyncRetrieveView):
+    serializer_class = CampaignSerializer
+    serialize_in_thread = True
+
+    def get_queryset(self):
+        return campaign_relations(
+            CampaignViewSet.queryset.all(), self.get_field_selection()
+        )
+
+
+class AsyncLocationList(AsyncListView):
+    serializer_class = LocationSerializer
+
+    def get_queryset(self):
+        return LocationModel.objects.all()
+
+
 # Event Registration API
 class EventRegister(generics.CreateAPIView):
     queryset = RegisterPeople.objects.all()
@@ -312,26 +455,83 @@ class EventRegister(generics.CreateAPIView):
         user = get_object_or_404(User, user_id=user_id)
         event = get_object_or_404(EventModel, event_id=event_id)
 
-        if RegisterPeople.objects.filter(user=user, event=event).exists():
+        # get_or_create: a concurrent duplicate hits register_event_user_uniq
+        # and finds the other request's row instead of failing
+        _, created = RegisterPeople.objects.get_or_create(
+            user=user, event=event, defaults={"registered_status": True}
+        )
+        if not created:
             return Response(
                 {"message": "User is already registered for this event"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        RegisterPeople.objects.create(user=user, event=event, registered_status=True)
         return Response(
             {"message": "Successfully Registered For This Event"},
             status=status.HTTP_201_CREATED,
         )
 
 
+# Registration export (admin only): /registrations/export/
+class RegistrationExportViewSet(NDJSONExportMixin, viewsets.GenericViewSet):
+    queryset = RegisterPeople.objects.all().order_by("registered_on")
+    serializer_class = RegistrationExportSerializer
+    permission_classes = [permissions.IsAdminUser]
+    export_filename = "registrations.ndjson"
+
+
+# Activity analytics export (admin only): /analytics/<dataset>/export/
+class ActivityExport(generics.GenericAPIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, dataset):
+        if dataset not in analytics.DATASETS:
+            raise Http404
+        response = StreamingHttpResponse(
+            analytics.stream_csv(analytics.DATASETS[dataset]),
+            content_type="text/csv",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{dataset}.csv"'
+        return response
+
+
+# Contribution statistics across campaigns: /stats/
+class ContributionStats(ReplicaReadMixin, generics.GenericAPIView):
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        return Response(stats.global_stats(stats.window_days(request)))
+
+
+# Personal activity feed: /feed/<user_id>/
+class FeedPagination(pagination.CursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-id"
+
+
+class FeedAPIView(generics.ListAPIView):
+    serializer_class = FeedEntrySerializer
+    pagination_class = FeedPagination
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        user_id = self.kwargs["user_id"]
+        if str(self.request.user.pk) != user_id and not self.request.user.is_staff:
+            raise PermissionDenied("You can only read your own feed.")
+        return feed.feed_for(user_id)
+
+
 # Volunteer History API
 class VolunteerHistory(generics.ListAPIView):
     serializer_class = HistroySerializer
 
     def get_queryset(self):
         user = get_object_or_404(User, user_id=self.kwargs["user_id"])
-        return CommentModel.objects.filter(user=user)
+        return CommentModel.objects.filter(user=user).annotate(
+            open_since=ledger.open_since()
+        )
 
 
 # Recent User Posts API
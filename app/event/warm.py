@@ -0,0 +1,27 @@
+from django.conf import settings
+
+from api.warmup import cache_group
+
+from .models import (
+    CampaignModel,
+    CommentModel,
+    EventModel,
+    LocationModel,
+    RegisterPeople,
+)
+
+cache_group(
+    "campaigns",
+    [("campaign-list", {})]
+    + [
+        ("campaign-list", {"page": page})
+        for page in range(2, settings.WARM_CACHE_PAGES + 1)
+    ],
+    models=[CampaignModel, CommentModel],
+)
+cache_group(
+    "events",
+    [("eventView-list", {}), ("eventView-list", {"is_available": "true"})],
+    models=[EventModel, RegisterPeople],
+)
+cache_group("locations", [("eventLocation", {})], models=[LocationModel])
@@ -2,6 +2,7 @@ from django.contrib import admin
 
 from .models import (
     CausesChoicesModel,
+    PasswordResetToken,
     Profile,
     ProfileCauses,
     ProfileSkills,
@@ -21,3 +22,4 @@ admin.site.register(SkillsModel)
 admin.site.register(CausesChoicesModel)
 admin.site.register(ProfileSkills)
 admin.site.register(ProfileCauses)
+admin.site.register(PasswordResetToken)
@@ -7,3 +7,4 @@ class UserConfig(AppConfig):
 
     def ready(self):
         import app.user.signals
+        import app.user.warm
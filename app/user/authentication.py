@@ -0,0 +1,141 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from api.cache import shared_cache
+
+from .models import User
+
+USER_CACHE_KEY = "auth_user_{}"
+REVOKED_CACHE_KEY = "auth_revoked_{}"
+
+
+def get_cached_user(user_id):
+    """Return the ``User`` for ``user_id``, served from a short-TTL cache."""
+    key = USER_CACHE_KEY.format(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = User.objects.select_related("profile").filter(user_id=user_id).first()
+        if user is not None:
+            cache.set(key, user, timeout=settings.AUTH_USER_CACHE_TIMEOUT)
+    return user
+
+
+def forget_cached_user(user_id):
+    cache.delete(USER_CACHE_KEY.format(user_id))
+
+
+def _tokens_valid_after(user_id):
+    """Unix time up to which ``user_id``'s access tokens are rejected, 0 if none."""
+    row = (
+        User.objects.filter(pk=user_id)
+        .values_list("is_active", "tokens_valid_after")
+        .first()
+    )
+    if row is None or not row[0]:
+        # deleted or deactivated: no token is accepted
+        return float("inf")
+    return row[1].timestamp() if row[1] else 0
+
+
+def _revocation_timeout():
+    return int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+
+
+def refresh_revocation(user_id):
+    """Replace the cached cutoff with the one stored on the user row."""
+    shared_cache.set(
+        REVOKED_CACHE_KEY.format(user_id),
+        _tokens_valid_after(user_id),
+        timeout=_revocation_timeout(),
+    )
+
+
+def revoke_user_tokens(user_id):
+    """
+    Reject every access token issued to ``user_id`` up to now. The cutoff is
+    stored on the user; the shared cache only fronts it, so an evicted or
+    lost entry is read back from the database. Returns the cutoff.
+    """
+    now = timezone.now()
+    User.objects.filter(pk=user_id).update(tokens_valid_after=now)
+    transaction.on_commit(lambda: refresh_revocation(user_id))
+    return now
+
+
+def is_token_revoked(validated_token):
+    user_id = validated_token[api_settings.USER_ID_CLAIM]
+    key = REVOKED_CACHE_KEY.format(user_id)
+    valid_after = shared_cache.get(key)
+    if valid_after is None:
+        valid_after = _tokens_valid_after(user_id)
+        # add, not set: never overwrite a cutoff a revocation stored meanwhile
+        shared_cache.add(key, valid_after, timeout=_revocation_timeout())
+    return bool(valid_after) and validated_token.get("iat", 0) <= valid_after
+
+
+class CachedTokenUser(TokenUser):
+    """
+    Stateless user backed by the validated token claims (``user_id``,
+    ``email``). Model fields that are not carried by the token are read from
+    the cached ``User`` the first time a view asks for them.
+    """
+
+    @cached_property
+    def user(self):
+        user = get_cached_user(self.id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        return user
+
+    @cached_property
+    def is_staff(self):
+        if "is_staff" in self.token:
+            return self.token["is_staff"]
+        return self.user.is_staff
+
+    @cached_property
+    def is_superuser(self):
+        if "is_superuser" in self.token:
+            return self.token["is_superuser"]
+        return self.user.is_superuser
+
+    def has_perm(self, perm, obj=None):
+        return self.user.has_perm(perm, obj)
+
+    def has_perms(self, perm_list, obj=None):
+        return self.user.has_perms(perm_list, obj)
+
+    def has_module_perms(self, module):
+        return self.user.has_module_perms(module)
+
+    def get_all_permissions(self, obj=None):
+        return self.user.get_all_permissions(obj)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_") or attr == "token":
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.user, attr)
+
+
+class CachedJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    JWT authentication without the per-request ``User`` query. Deactivated or
+    deleted users are rejected through their revocation cutoff, read from the
+    shared cache in front of ``User.tokens_valid_after``.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        if is_token_revoked(validated_token):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        return user
@@ -0,0 +1,217 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection, transaction
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from api.cache import shared_cache
+
+GENERATION_CACHE_KEY = "token_blacklist_generation"
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings (no false negatives)."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = capacity
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+def _shared_cache():
+    """The shared cache, unless it is configured private to this process."""
+    if isinstance(caches["shared"], (LocMemCache, DummyCache)):
+        return None
+    return shared_cache
+
+
+class BlacklistFilter:
+    """
+    In-memory front for the refresh-token blacklist. A jti that is not in the
+    bloom filter is known not to be blacklisted, so the DB lookup is only made
+    for (rare) positives.
+
+    The filter follows new blacklist rows by ``blacklisted_at``, re-reading
+    the last ``TOKEN_BLACKLIST_SYNC_GRACE`` seconds on every sync: rows
+    inserted concurrently can commit out of order, so a row is not missed
+    for committing after a newer one was seen. A generation counter in the
+    shared cache, bumped once the blacklisting transaction commits, lets a
+    worker skip even that query while nothing has been blacklisted elsewhere.
+
+    Every ``TOKEN_BLACKLIST_BLOOM_REBUILD`` seconds, or once it outgrows its
+    capacity, the filter is rebuilt from the unexpired rows in a background
+    thread while requests keep using the current one. Until the first build
+    finishes every check goes to the DB.
+    """
+
+    min_capacity = 1024
+    rebuild_in_background = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._since = None
+        # ids of the rows already added that the next sync reads again
+        self._recent = {}
+        self._generation = None
+        self._built_at = 0
+        self._rebuilding = False
+
+    def _build(self):
+        started = aware_utcnow()
+        rows = BlacklistedToken.objects.filter(
+            token__expires_at__gt=started
+        ).values_list("token__jti", flat=True)
+        bloom = BloomFilter(max(rows.count() * 2, self.min_capacity))
+        for jti in rows.iterator(chunk_size=5000):
+            bloom.add(jti)
+        return bloom, started
+
+    def _install(self, bloom, started):
+        self._bloom = bloom
+        self._since = started - timedelta(seconds=settings.TOKEN_BLACKLIST_SYNC_GRACE)
+        self._recent = {}
+        # catch up on rows blacklisted during the build
+        self._generation = None
+        self._built_at = time.monotonic()
+
+    def _rebuild_in_thread(self):
+        try:
+            built = self._build()
+            with self._lock:
+                self._install(*built)
+        finally:
+            self._rebuilding = False
+            connection.close()
+
+    def _start_rebuild(self):
+        if not self.rebuild_in_background:
+            self._install(*self._build())
+        elif not self._rebuilding:
+            self._rebuilding = True
+            threading.Thread(target=self._rebuild_in_thread, daemon=True).start()
+
+    def _sync(self):
+        started = aware_utcnow()
+        rows = BlacklistedToken.objects.filter(
+            blacklisted_at__gte=self._since
+        ).values_list("id", "token__jti", "blacklisted_at")
+        for pk, jti, blacklisted_at in rows:
+            if pk not in self._recent:
+                self._bloom.add(jti)
+                self._recent[pk] = blacklisted_at
+        self._since = started - timedelta(seconds=settings.TOKEN_BLACKLIST_SYNC_GRACE)
+        self._recent = {
+            pk: blacklisted_at
+            for pk, blacklisted_at in self._recent.items()
+            if blacklisted_at >= self._since
+        }
+
+    def _is_stale(self):
+        return (
+            self._bloom.count > self._bloom.capacity
+            or time.monotonic() - self._built_at
+            > settings.TOKEN_BLACKLIST_BLOOM_REBUILD
+        )
+
+    def might_contain(self, jti):
+        shared = _shared_cache()
+        with self._lock:
+            if self._bloom is None:
+                self._start_rebuild()
+                if self._bloom is None:
+                    return True
+            elif self._is_stale():
+                self._start_rebuild()
+            # read the generation before syncing so a concurrent bump is
+            # picked up on the next call rather than lost
+            generation = shared.get(GENERATION_CACHE_KEY) if shared else None
+            if generation is None or generation != self._generation:
+                self._sync()
+            self._generation = generation
+            return jti in self._bloom
+
+    def add(self, jti):
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+        if _shared_cache() is not None:
+            transaction.on_commit(self._bump_generation)
+
+    def _bump_generation(self):
+        try:
+            shared_cache.incr(GENERATION_CACHE_KEY)
+        except ValueError:
+            shared_cache.set(GENERATION_CACHE_KEY, 1, timeout=None)
+
+
+blacklist_filter = BlacklistFilter()
+
+
+class BloomRefreshToken(RefreshToken):
+    """Refresh token whose blacklist check goes through ``blacklist_filter``."""
+
+    def check_blacklist(self):
+        if blacklist_filter.might_contain(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+    def blacklist(self):
+        blacklisted = super().blacklist()
+        blacklist_filter.add(self.payload[api_settings.JTI_CLAIM])
+        return blacklisted
+
+
+def prune_expired_tokens(batch_size=5000):
+    """
+    Delete expired outstanding tokens (and their blacklist rows) in batches
+    so the token tables stay bounded. Returns the number of tokens removed.
+    """
+    now = aware_utcnow()
+    deleted = 0
+    while True:
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=now)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            BlacklistedToken.objects.filter(token_id__in=ids).delete()
+            OutstandingToken.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
@@ -0,0 +1,32 @@
+"""
+Bounded pool for password hashing on request threads.
+
+The pool caps how many hashes run at once, so a signup burst queues instead
+of oversubscribing the CPU. PBKDF2, scrypt and argon2 release the GIL while
+hashing, so threads are enough.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_WORKERS,
+                thread_name_prefix="password-hashing",
+            )
+    return _pool
+
+
+def hash_password(raw_password):
+    """``make_password`` run on the bounded hashing pool."""
+    return get_pool().submit(make_password, raw_password).result()
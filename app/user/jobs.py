@@ -0,0 +1,14 @@
+from api.scheduler import job
+
+from .blacklist import prune_expired_tokens
+from .models import PasswordResetToken
+
+
+@job(cron="@hourly")
+def purge_reset_tokens():
+    PasswordResetToken.purge_expired()
+
+
+@job(cron="30 3 * * *")
+def prune_refresh_tokens():
+    prune_expired_tokens()
@@ -0,0 +1,50 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures password hashing throughput (hashes/second) for each "
+        "configured hasher, on one thread and across a thread pool"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seconds", type=float, default=3.0)
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+
+    def measure(self, hasher, seconds, workers):
+        deadline = time.monotonic() + seconds
+
+        def run():
+            count = 0
+            while time.monotonic() < deadline:
+                hasher.encode("correct horse battery staple", hasher.salt())
+                count += 1
+            return count
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            total = sum(pool.map(lambda _: run(), range(workers)))
+        return total / (time.monotonic() - started)
+
+    def handle(self, *args, **options):
+        seconds, workers = options["seconds"], options["workers"]
+        self.stdout.write(f"{'hasher':<14}{'1 thread':>12}{f'{workers} threads':>14}")
+        for path in settings.PASSWORD_HASHERS:
+            try:
+                hasher = get_hasher(import_string(path).algorithm)
+            except ValueError as e:
+                self.stderr.write(f"{path}: {e}")
+                continue
+            single = self.measure(hasher, seconds, 1)
+            pooled = self.measure(hasher, seconds, workers)
+            self.stdout.write(
+                f"{hasher.algorithm:<14}{single:>10.1f}/s{pooled:>12.1f}/s"
+                f"  ({pooled / workers:.1f}/s per core)"
+            )
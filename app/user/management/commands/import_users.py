@@ -0,0 +1,35 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.user.provisioning import process_pool, provision_users
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-creates users and profiles from a CSV file with an email column "
+        "and optional first_name, last_name, username and password columns"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers", type=int, default=None, help="Password hashing processes"
+        )
+
+    def handle(self, *args, **options):
+        with open(options["path"], newline="") as fileobj:
+            rows = [row for row in csv.DictReader(fileobj) if row.get("email")]
+        started = time.monotonic()
+        with process_pool(options["workers"]) as pool:
+            created, skipped = provision_users(
+                rows, batch_size=options["batch_size"], pool=pool
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {created} users, skipped {skipped} "
+                f"({time.monotonic() - started:.1f}s)"
+            )
+        )
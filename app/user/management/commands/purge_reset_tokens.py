@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from app.user.models import PasswordResetToken
+
+
+class Command(BaseCommand):
+    help = "Deletes expired password reset tokens"
+
+    def handle(self, *args, **options):
+        deleted = PasswordResetToken.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} reset tokens"))
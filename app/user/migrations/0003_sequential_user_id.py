@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-19 19:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_id_sequence'),
+        ('user', '0002_password_reset_token'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='user_id',
+            field=models.CharField(editable=False, max_length=20, primary_key=True, serialize=False),
+        ),
+    ]
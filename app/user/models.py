@@ -1,38 +1,96 @@
+import hashlib
+import secrets
+
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Max
+from django.db.models.functions import Cast
+from django.utils import timezone
 from django.utils.text import slugify
-from shortuuid.django_fields import ShortUUIDField
+
+from api.ids import advance_sequence, next_id, record_collision
 
 # Create your models here.
 
+# Ids from the "user" sequence start at 10 digits so they never clash with the
+# 6-digit random ids issued before, and sort in creation order among themselves.
+USER_ID_START = 10**9
+
+
+def new_user_id():
+    return str(next_id("user", start=USER_ID_START))
+
 
 class User(AbstractUser):
     # user information:
-    user_id = ShortUUIDField(
-        length=6, max_length=6, alphabet="0123456789", primary_key=True
-    )
+    # assigned from the "user" sequence on first save (bulk_create callers set
+    # it with new_user_id), not as a field default, so that merely building a
+    # User does not reserve an id
+    user_id = models.CharField(max_length=20, primary_key=True, editable=False)
     username = models.CharField(max_length=30, unique=True, db_index=True)
     first_name = models.CharField(max_length=50, blank=True, null=True)
     last_name = models.CharField(max_length=50, blank=True, null=True)
     email = models.EmailField(unique=True, db_index=True)
     full_name = models.CharField(max_length=100, blank=True, null=True)
-    otp = models.CharField(
-        unique=True, max_length=20, null=True, blank=True, db_index=True
-    )
     created_at = models.DateTimeField(auto_now_add=True)
+    # access tokens issued up to this time are rejected (deactivation)
+    tokens_valid_after = models.DateTimeField(null=True, blank=True, editable=False)
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
+    # fields whose changes the post_save handlers react to
+    tracked_fields = ("full_name", "is_active")
 
     def __str__(self):
         return self.full_name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_tracked_fields()
+        return instance
+
+    def remember_tracked_fields(self):
+        deferred = self.get_deferred_fields()
+        self._tracked_values = {
+            name: getattr(self, name)
+            for name in self.tracked_fields
+            if name not in deferred
+        }
+
+    def tracked_field_changed(self, name):
+        """True if ``name`` differs from its value when loaded or last saved."""
+        if name in self.get_deferred_fields():
+            return False
+        tracked = getattr(self, "_tracked_values", {})
+        return name not in tracked or tracked[name] != getattr(self, name)
+
     def save(self, *args, **kwargs):
         email_user, _ = self.email.split("@")
         if self.username == "" or self.username is None:
             self.username = email_user
         if self.full_name == "" or self.full_name is None:
             self.full_name = f"{self.first_name} {self.last_name}"
-        super(User, self).save(*args, **kwargs)
+        if not self._state.adding or self.user_id:
+            return super(User, self).save(*args, **kwargs)
+        self.user_id = new_user_id()
+        # insert, never update: a sequence row restored behind the table would
+        # re-issue taken ids, so a clash is counted and the sequence moved past
+        # the highest id in use
+        kwargs["force_insert"] = True
+        for attempt in range(3):
+            try:
+                with transaction.atomic():
+                    return super(User, self).save(*args, **kwargs)
+            except IntegrityError:
+                if attempt == 2 or not User.objects.filter(pk=self.pk).exists():
+                    raise
+                record_collision("user")
+                highest = User.objects.aggregate(
+                    highest=Max(Cast("user_id", models.BigIntegerField()))
+                )["highest"]
+                advance_sequence("user", highest)
+                self.user_id = new_user_id()
 
     def Profile(self):
         return Profile.objects.filter(user=self).first()
@@ -116,3 +174,60 @@ class ProfileCauses(models.Model):  # 👈 Custom Many-to-Many Table
 
     class Meta:
         unique_together = ("profile", "cause")
+
+
+class PasswordResetToken(models.Model):
+    """
+    Single-use password reset token. Only the SHA-256 of the token is stored
+    and looked up, so reset requests never rewrite the ``User`` row.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="reset_tokens"
+    )
+    token_hash = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"Reset token for {self.user_id} (expires {self.expires_at})"
+
+    @staticmethod
+    def hash_token(token):
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @classmethod
+    def issue(cls, user):
+        """Replace ``user``'s reset tokens with a new one; returns the raw token."""
+        token = secrets.token_urlsafe(32)
+        cls.objects.filter(user=user).delete()
+        cls.objects.create(
+            user=user,
+            token_hash=cls.hash_token(token),
+            expires_at=timezone.now() + settings.PASSWORD_RESET_TOKEN_LIFETIME,
+        )
+        return token
+
+    @classmethod
+    def consume(cls, token, user_id):
+        """Return the user for a valid ``token`` and invalidate their tokens."""
+        reset_token = (
+            cls.objects.select_related("user")
+            .filter(
+                token_hash=cls.hash_token(token),
+                user_id=user_id,
+                expires_at__gt=timezone.now(),
+            )
+            .first()
+        )
+        if reset_token is None:
+            return None
+        # the delete is the claim: of two concurrent requests, one deletes it
+        if not cls.objects.filter(pk=reset_token.pk).delete()[0]:
+            return None
+        cls.objects.filter(user_id=reset_token.user_id).delete()
+        return reset_token.user
+
+    @classmethod
+    def purge_expired(cls):
+        return cls.objects.filter(expires_at__lte=timezone.now()).delete()[0]
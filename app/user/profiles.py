@@ -0,0 +1,72 @@
+"""
+Profile edits.
+
+``ProfileUpdate`` writes only what changed: the user and profile rows with
+``update_fields``, and a profile's skills and interests by their difference
+from the submitted ids -- one delete of the removed links and one insert of
+the added ones. Submitted ids are checked against the known skill and cause
+ids, cached in the shared cache and dropped whenever those tables change.
+"""
+
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+
+from api.cache import shared_cache
+
+KNOWN_IDS_KEY = "known_ids:{}"
+
+
+def known_ids(model):
+    """Primary keys of a reference table (skills, causes)."""
+    key = KNOWN_IDS_KEY.format(model._meta.label_lower)
+    ids = shared_cache.get(key)
+    if ids is None:
+        ids = frozenset(model.objects.values_list("pk", flat=True))
+        shared_cache.set(key, ids, timeout=settings.KNOWN_IDS_TIMEOUT)
+    return ids
+
+
+def forget_known_ids(model):
+    shared_cache.delete(KNOWN_IDS_KEY.format(model._meta.label_lower))
+
+
+def clean_ids(values, model, name):
+    """``values`` (an id list, or empty to clear) as a set of known ids."""
+    if not values:
+        return set()
+    if not isinstance(values, (list, tuple)):
+        values = [values]
+    try:
+        ids = {int(value) for value in values}
+    except (TypeError, ValueError):
+        raise ValidationError({name: "Must be a list of ids."})
+    unknown = ids - known_ids(model)
+    if unknown:
+        raise ValidationError(
+            {name: f"Unknown ids: {', '.join(map(str, sorted(unknown)))}"}
+        )
+    return ids
+
+
+def assign(instance, values):
+    """Set ``values`` on ``instance``; returns the names of those that changed."""
+    changed = []
+    for name, value in values.items():
+        if getattr(instance, name) != value:
+            setattr(instance, name, value)
+            changed.append(name)
+    return changed
+
+
+def sync_links(links, profile, field, ids):
+    """Make ``profile``'s rows in ``links`` point at exactly ``ids``."""
+    rows = links.objects.filter(profile=profile)
+    current = set(rows.values_list(field, flat=True))
+    removed, added = current - ids, ids - current
+    if removed:
+        rows.filter(**{f"{field}__in": removed}).delete()
+    if added:
+        links.objects.bulk_create(
+            [links(profile=profile, **{field: pk}) for pk in added],
+            ignore_conflicts=True,
+        )
@@ -0,0 +1,113 @@
+"""
+Bulk user provisioning for partner organisations.
+
+Users and profiles are inserted with ``bulk_create`` (no per-row save or
+post_save signals). Passwords are hashed on the bounded request-thread pool
+(hashing.py); ``manage.py import_users`` hashes large files in a process pool
+instead.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from . import hashing
+from .models import Profile, User, new_user_id
+
+
+def _hash_password(raw_password):
+    # None gives an unusable password, as for ``set_unusable_password``
+    return make_password(raw_password or None)
+
+
+def _unique_usernames(users):
+    """Suffix usernames that clash inside the batch or with existing users."""
+    wanted = {user.username for user in users}
+    taken = set(
+        User.objects.filter(username__in=wanted).values_list("username", flat=True)
+    )
+    for user in users:
+        if user.username in taken:
+            user.username = f"{user.username[:19]}_{user.user_id}"
+        taken.add(user.username)
+
+
+def _build_users(rows, passwords):
+    users = []
+    for row, password in zip(rows, passwords):
+        email = row["email"]
+        first_name = row.get("first_name") or None
+        last_name = row.get("last_name") or None
+        users.append(
+            User(
+                user_id=new_user_id(),
+                email=email,
+                username=row.get("username") or email.split("@")[0],
+                first_name=first_name,
+                last_name=last_name,
+                full_name=f"{first_name} {last_name}",
+                password=password,
+                is_active=row.get("is_active", True),
+            )
+        )
+    return users
+
+
+def process_pool(workers=None):
+    """Password hashing processes, for imports run outside a request."""
+    return ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count() or 1, initializer=django.setup
+    )
+
+
+def provision_users(rows, batch_size=1000, pool=None):
+    """
+    Create users (and their profiles) from ``rows``: dicts with ``email`` and
+    optional ``first_name``, ``last_name``, ``username``, ``password`` and
+    ``is_active``. Emails are normalized as on registration, and those that
+    already exist in any letter case are skipped. Passwords are hashed on
+    ``pool``, by default the bounded hashing thread pool.
+
+    Returns ``(created, skipped)``.
+    """
+    unique_rows = []
+    seen_emails = set()
+    for row in rows:
+        # as registration does; duplicates are found case-insensitively
+        email = User.objects.normalize_email(row["email"])
+        if email.lower() not in seen_emails:
+            seen_emails.add(email.lower())
+            unique_rows.append({**row, "email": email})
+    created, skipped = 0, len(rows) - len(unique_rows)
+    pool = pool or hashing.get_pool()
+    for start in range(0, len(unique_rows), batch_size):
+        batch = unique_rows[start : start + batch_size]
+        existing = set(
+            User.objects.annotate(email_lower=Lower("email"))
+            .filter(email_lower__in=[row["email"].lower() for row in batch])
+            .values_list("email_lower", flat=True)
+        )
+        skipped += len(existing)
+        batch = [row for row in batch if row["email"].lower() not in existing]
+        if not batch:
+            continue
+
+        passwords = pool.map(
+            _hash_password,
+            [row.get("password") for row in batch],
+            # process pools only: fewer, larger round trips
+            chunksize=max(1, len(batch) // 64),
+        )
+        users = _build_users(batch, passwords)
+        _unique_usernames(users)
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            Profile.objects.bulk_create(
+                [Profile(user=user, full_name=user.full_name) for user in users]
+            )
+        created += len(users)
+    return created, skipped
@@ -1,6 +1,14 @@
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+
+from api.fieldsets import SparseFieldsMixin
+
+from .blacklist import BloomRefreshToken
+from .hashing import hash_password
 
 from .models import (
     CausesChoicesModel,
@@ -21,6 +29,10 @@ class CustomTokenSerializer(TokenObtainPairSerializer):
         return token
 
 
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = BloomRefreshToken
+
+
 class SkillModelSerializer(serializers.ModelSerializer):
     class Meta:
         model = SkillsModel
@@ -61,7 +73,7 @@ class ProfileSerializer(serializers.ModelSerializer):
         ]
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     Profile = ProfileSerializer()
     user_skills = ProfileSkillsSerializer(many=True)
     user_interest = ProfileCauseSerializer(many=True)
@@ -107,13 +119,24 @@ class RegistrationSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data.pop("password2")  # Remove duplicate password field
-        user = User.objects.create_user(
-            username=validated_data["email"].split("@")[0],
+        email = User.objects.normalize_email(validated_data["email"])
+        user = User(
+            username=email.split("@")[0],
             first_name=validated_data["first_name"],
             last_name=validated_data["last_name"],
-            email=validated_data["email"],
-            password=validated_data["password"],
+            email=email,
+            is_active=False,  # Require email confirmation
         )
-        user.is_active = False  # Require email confirmation
+        user.password = hash_password(validated_data["password"])
         user.save()
         return user
+
+
+class BulkUserSerializer(serializers.Serializer):
+    email = serializers.EmailField()
+    first_name = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    last_name = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    username = serializers.CharField(max_length=30, required=False, allow_blank=True)
+    password = serializers.CharField(
+        write_only=True, required=False, validators=[validate_password]
+    )
@@ -1,21 +1,52 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 
-from .models import Profile, User
+from .authentication import (
+    forget_cached_user,
+    refresh_revocation,
+    revoke_user_tokens,
+)
+from .models import CausesChoicesModel, Profile, SkillsModel, User
+from .profiles import forget_known_ids
 
 
-def create_user_profile(sender, instance, created, **kwargs):
+def create_user_profile(sender, instance, created, update_fields=None, **kwargs):
     if created:
         Profile.objects.create(user=instance)
-    else:
-        profile = instance.profile
-        if profile.full_name != instance.full_name:
-            profile.full_name = instance.full_name
-            profile.save()
+    elif (
+        update_fields is None or "full_name" in update_fields
+    ) and instance.tracked_field_changed("full_name"):
+        Profile.objects.filter(user=instance).update(full_name=instance.full_name)
 
 
-def save_user_profile(sender, instance, **kwargs):
-    instance.profile.save()
+def refresh_auth_cache(sender, instance, created, **kwargs):
+    forget_cached_user(instance.pk)
+    if not created and instance.tracked_field_changed("is_active"):
+        if instance.is_active:
+            transaction.on_commit(lambda: refresh_revocation(instance.pk))
+        else:
+            # kept on the instance so saving it again does not clear it
+            instance.tokens_valid_after = revoke_user_tokens(instance.pk)
+
+
+def remember_tracked_fields(sender, instance, **kwargs):
+    instance.remember_tracked_fields()
+
+
+def refresh_known_ids(sender, **kwargs):
+    forget_known_ids(sender)
+
+
+def revoke_deleted_user(sender, instance, **kwargs):
+    forget_cached_user(instance.pk)
+    revoke_user_tokens(instance.pk)
 
 
 post_save.connect(create_user_profile, sender=User)
-post_save.connect(save_user_profile, sender=User)
+post_save.connect(refresh_auth_cache, sender=User)
+# must stay last: the handlers above compare against the previous values
+post_save.connect(remember_tracked_fields, sender=User)
+post_delete.connect(revoke_deleted_user, sender=User)
+for model in (SkillsModel, CausesChoicesModel):
+    post_save.connect(refresh_known_ids, sender=model)
+    post_delete.connect(refresh_known_ids, sender=model)
@@ -1,3 +1,126 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from api.cache import shared_cache
+
+from .authentication import CachedTokenUser
+from .blacklist import GENERATION_CACHE_KEY, BlacklistFilter
+from .models import PasswordResetToken, User
+from .provisioning import provision_users
+
+
+def make_user(name, **extra):
+    return User.objects.create_user(
+        username=name, email=f"{name}@example.com", password="pw-12345!", **extra
+    )
+
+
+class BlacklistFilterTests(TestCase):
+    def setUp(self):
+        self.filter = BlacklistFilter()
+        self.filter.rebuild_in_background = False
+        self.generation = 0
+
+    def blacklist(self, jti, blacklisted_at=None, **fields):
+        token = OutstandingToken.objects.create(
+            jti=jti, token=jti, expires_at=aware_utcnow() + timedelta(days=1)
+        )
+        row = BlacklistedToken.objects.create(token=token, **fields)
+        if blacklisted_at is not None:
+            BlacklistedToken.objects.filter(pk=row.pk).update(
+                blacklisted_at=blacklisted_at
+            )
+        # what the blacklisting worker does once its transaction commits
+        self.generation += 1
+        shared_cache.set(GENERATION_CACHE_KEY, self.generation)
+
+    def test_follows_new_rows(self):
+        self.blacklist("first")
+        self.assertTrue(self.filter.might_contain("first"))
+        self.assertFalse(self.filter.might_contain("second"))
+        self.blacklist("second")
+        self.assertTrue(self.filter.might_contain("second"))
+
+    def test_row_committed_out_of_order_is_synced(self):
+        self.assertFalse(self.filter.might_contain("late"))
+        self.blacklist("newer", pk=10)
+        self.assertTrue(self.filter.might_contain("newer"))
+        # a lower id, stamped before the last sync, that only commits now
+        self.blacklist(
+            "late", blacklisted_at=aware_utcnow() - timedelta(seconds=5), pk=5
+        )
+        self.assertTrue(self.filter.might_contain("late"))
+
+    def test_resync_does_not_count_rows_twice(self):
+        self.blacklist("once")
+        self.filter.might_contain("once")
+        count = self.filter._bloom.count
+        shared_cache.set(GENERATION_CACHE_KEY, self.generation + 1)
+        self.filter.might_contain("once")
+        self.assertEqual(self.filter._bloom.count, count)
+
+    def test_cold_filter_falls_through_to_the_database(self):
+        self.filter.rebuild_in_background = True
+        with mock.patch("threading.Thread") as thread:
+            self.assertTrue(self.filter.might_contain("anything"))
+            self.assertTrue(self.filter.might_contain("anything"))
+        thread.assert_called_once()
+
+
+class PasswordResetTokenTests(TestCase):
+    def test_consume_once(self):
+        user = make_user("reset")
+        token = PasswordResetToken.issue(user)
+        self.assertEqual(PasswordResetToken.consume(token, user.pk), user)
+        self.assertIsNone(PasswordResetToken.consume(token, user.pk))
+
+    def test_consume_rejects_other_users_and_expired_tokens(self):
+        user, other = make_user("owner"), make_user("other")
+        token = PasswordResetToken.issue(user)
+        self.assertIsNone(PasswordResetToken.consume(token, other.pk))
+        PasswordResetToken.objects.update(expires_at=aware_utcnow())
+        self.assertIsNone(PasswordResetToken.consume(token, user.pk))
+
+    def test_issue_replaces_earlier_tokens(self):
+        user = make_user("twice")
+        first = PasswordResetToken.issue(user)
+        second = PasswordResetToken.issue(user)
+        self.assertIsNone(PasswordResetToken.consume(first, user.pk))
+        self.assertEqual(PasswordResetToken.consume(second, user.pk), user)
+
+
+class CachedTokenUserTests(SimpleTestCase):
+    def test_claims_are_read_without_loading_the_user(self):
+        user = CachedTokenUser({"user_id": "1", "is_staff": True})
+        with mock.patch("app.user.authentication.get_cached_user") as get:
+            self.assertTrue(user.is_staff)
+        get.assert_not_called()
+
+    def test_missing_claims_are_read_from_the_user(self):
+        user = CachedTokenUser({"user_id": "1"})
+        with mock.patch("app.user.authentication.get_cached_user") as get:
+            get.return_value.is_superuser = True
+            self.assertTrue(user.is_superuser)
+        get.assert_called_once_with("1")
+
+
+class ProvisionUsersTests(TestCase):
+    def test_skips_existing_emails_in_any_case(self):
+        make_user("Taken")
+        created, skipped = provision_users(
+            [
+                {"email": "taken@EXAMPLE.com"},
+                {"email": "New@Example.COM", "password": "pw-12345!"},
+                {"email": "new@example.com"},
+            ]
+        )
+        self.assertEqual((created, skipped), (1, 2))
+        user = User.objects.get(email="New@example.com")
+        self.assertTrue(user.check_password("pw-12345!"))
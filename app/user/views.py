@@ -1,7 +1,9 @@
 from datetime import timedelta
 
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
 from django.core.mail import BadHeaderError, EmailMultiAlternatives
+from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect
 from django.template.loader import render_to_string
 from django.utils.encoding import force_bytes, force_str
@@ -9,20 +11,24 @@ from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from django.utils.timezone import now
 from rest_framework import generics, status
 from rest_framework.authentication import SessionAuthentication
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from _backend.settings.production import BACKEND_URL, FRONTEND_URL
+from api.asynchronous import AsyncListView
+from api.db_routers import ReplicaReadMixin
+from api.fieldsets import FieldSelectionMixin
+from api.warmup import WarmCacheMixin
 
 from . import models as user_model
+from . import profiles
 from . import serializers as user_serializer
-from .validators import generate_random_otp
+from .provisioning import provision_users
 
 
 # Create your views here.
-class UserAPIView(generics.ListAPIView):
+class UserAPIView(ReplicaReadMixin, FieldSelectionMixin, generics.ListAPIView):
     serializer_class = user_serializer.UserSerializer
     permission_classes = [AllowAny]
 
@@ -37,6 +43,7 @@ class CreateUserAPIView(generics.CreateAPIView):
     serializer_class = user_serializer.RegistrationSerializer
     permission_classes = [AllowAny]
     authentication_classes = [SessionAuthentication]
+    throttle_scope = "register"
 
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
@@ -46,7 +53,7 @@ class CreateUserAPIView(generics.CreateAPIView):
             token = default_token_generator.make_token(user)
             uid = urlsafe_base64_encode(force_bytes(user.user_id))
             #
-            confirm_link = f"{BACKEND_URL}/user/activate/{uid}/{token}"
+            confirm_link = f"{settings.BACKEND_URL}/user/activate/{uid}/{token}"
             email_subject = "Confirm your mail"
             email_body = render_to_string(
                 "confirm_email.html", {"confirm_link": confirm_link}
@@ -76,6 +83,29 @@ class CreateUserAPIView(generics.CreateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class BulkProvisionUsersAPIView(generics.CreateAPIView):
+    """
+    Admin-only bulk import: POST a list of
+    {"email", "first_name", "last_name", "username", "password"} objects.
+    Existing emails are skipped; no activation mail is sent. Up to
+    BULK_PROVISION_MAX_ROWS users per request; larger files go through
+    ``manage.py import_users``.
+    """
+
+    serializer_class = user_serializer.BulkUserSerializer
+    permission_classes = [IsAdminUser]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(
+            data=request.data, many=True, max_length=settings.BULK_PROVISION_MAX_ROWS
+        )
+        serializer.is_valid(raise_exception=True)
+        created, skipped = provision_users(serializer.validated_data)
+        return Response(
+            {"created": created, "skipped": skipped}, status=status.HTTP_201_CREATED
+        )
+
+
 def token_valid(user, token):
     token_age = now() - user.created_at
     return token_age < timedelta(minutes=10) and default_token_generator.check_token(
@@ -88,20 +118,25 @@ def activate_account(request, uid64, token):
         uid = force_str(urlsafe_base64_decode(uid64))
         user = user_model.User.objects.get(user_id=uid)
     except user_model.User.DoesNotExist:
-        return redirect(f"{FRONTEND_URL}/invalid-link")
+        return redirect(f"{settings.FRONTEND_URL}/invalid-link")
     except Exception as e:
         Response({"detail": f"Error in activation: {e}"})
-        return redirect(f"{FRONTEND_URL}/invalid-link")
+        return redirect(f"{settings.FRONTEND_URL}/invalid-link")
     if user is not None and token_valid(user, token):
         user.is_active = True
         user.save()
-        return redirect(f"{FRONTEND_URL}/auth/sign-in")
-    return redirect(f"{FRONTEND_URL}")
+        return redirect(f"{settings.FRONTEND_URL}/auth/sign-in")
+    return redirect(f"{settings.FRONTEND_URL}")
 
 
 class LoginTokenAPIView(TokenObtainPairView):
     serializer_class = user_serializer.CustomTokenSerializer
     permission_classes = [AllowAny]
+    throttle_scope = "login"
+
+
+class TokenRefreshAPIView(TokenRefreshView):
+    serializer_class = user_serializer.CustomTokenRefreshSerializer
 
 
 #
@@ -112,18 +147,16 @@ class ResetPasswordView(generics.RetrieveAPIView):
     def get_object(self):
         email = self.kwargs["email"]
         user = (
-            user_model.User.objects.only("email", "otp", "user_id")
+            user_model.User.objects.only("email", "username", "user_id", "is_active")
             .filter(email=email)
             .first()
         )
         if user:
-            user.otp = generate_random_otp()
+            otp = user_model.PasswordResetToken.issue(user)
             uuidb64 = user.pk
             refresh = RefreshToken.for_user(user)
             refreshToken = str(refresh.access_token)
-            user.refresh = refreshToken
-            user.save()
-            link = f"{FRONTEND_URL}/create-new-password/?otp={user.otp}&uuidb64={uuidb64}&refresh={refreshToken}"
+            link = f"{settings.FRONTEND_URL}/create-new-password/?otp={otp}&uuidb64={uuidb64}&refresh={refreshToken}"
             merge_data = {
                 "link": link,
                 "username": user.username,
@@ -165,22 +198,29 @@ class PasswordChangeAPIView(generics.CreateAPIView):
     serializer_class = user_serializer.UserSerializer
 
     def create(self, request, *args, **kwargs):
-        otp = request.data["otp"]
-        uuidb64 = request.data["uuidb64"]
-        password = request.data["password"]
+        otp = request.data.get("otp")
+        uuidb64 = request.data.get("uuidb64")
+        password = request.data.get("password")
+        if not all([otp, uuidb64, password]):
+            return Response(
+                {"message": "otp, uuidb64 and password are required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        user = user_model.User.objects.only("user_id").get(otp=otp, user_id=uuidb64)
+        with transaction.atomic():
+            user = user_model.PasswordResetToken.consume(otp, uuidb64)
+            if user:
+                user.set_password(password)
+                user.save(update_fields=["password"])
         if user:
-            user.set_password(password)
-            user.otp = ""
-            user.save()
             return Response(
                 {"message": "Password Change Successfully"},
                 status=status.HTTP_201_CREATED,
             )
         else:
             return Response(
-                {"message": "User doesn't exist"}, status=status.HTTP_404_NOT_FOUND
+                {"message": "Reset link is invalid or has expired"},
+                status=status.HTTP_404_NOT_FOUND,
             )
 
 
@@ -203,8 +243,7 @@ class PasswordUpdateAPIView(generics.UpdateAPIView):
 
         user = get_object_or_404(user_model.User, user_id=user_id)
         user.set_password(password)
-        user.otp = ""
-        user.save()
+        user.save(update_fields=["password"])
 
         return Response(
             {"message": "Password changed successfully"}, status=status.HTTP_200_OK
@@ -217,64 +256,98 @@ class ProfileUpdate(generics.RetrieveUpdateAPIView):
 
     def get_object(self):
         user_id = self.kwargs["user_id"]
-        return user_model.Profile.objects.get(user__user_id=user_id)
+        return user_model.Profile.objects.select_related("user").get(
+            user__user_id=user_id
+        )
 
+    @transaction.atomic
     def perform_update(self, serializer):
         profile = serializer.instance
+        user = profile.user
         data = self.request.data
 
+        # validated before anything is written
+        skills = interests = None
+        if "skills" in data:
+            skills = profiles.clean_ids(
+                data["skills"], user_model.SkillsModel, "skills"
+            )
+        if "interests" in data:
+            interests = profiles.clean_ids(
+                data["interests"], user_model.CausesChoicesModel, "interests"
+            )
+
+        values = {}
         first_name = data.get("first_name")
         last_name = data.get("last_name")
         if first_name or last_name:
-            profile.user.first_name = first_name
-            profile.user.last_name = last_name
-            profile.full_name = f"{first_name} {last_name}"
-            profile.user.full_name = f"{first_name} {last_name}"
-            profile.user.save()
-
+            full_name = f"{first_name} {last_name}"
+            user_fields = profiles.assign(
+                user,
+                {
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "full_name": full_name,
+                },
+            )
+            if user_fields:
+                user.save(update_fields=user_fields)
+            if "full_name" in user_fields:
+                # already copied to the profile row by create_user_profile
+                profile.full_name = full_name
+            values["full_name"] = full_name
         if "location" in data:
-            profile.city = data["location"]
+            values["city"] = data["location"]
         if "personal_info" in data:
-            profile.info = data["personal_info"]
-        profile.save()
-
-        if "skills" in data:
-            skills = data["skills"]
-            if skills:
-                profile.skills.all().delete()
-                user_model.ProfileSkills.objects.bulk_create(
-                    [
-                        user_model.ProfileSkills(profile=profile, skill_id=skill)
-                        for skill in skills
-                    ]
-                )
-            else:
-                profile.skills.all().delete()
-
-        if "interests" in data:
-            interests = data["interests"]
-            if interests:
-                profile.causes.all().delete()
-                user_model.ProfileCauses.objects.bulk_create(
-                    [
-                        user_model.ProfileCauses(profile=profile, cause_id=interest)
-                        for interest in interests
-                    ]
-                )
-            else:
-                profile.causes.all().delete()
-
-        serializer.save()
+            values["info"] = data["personal_info"]
+        values.update(serializer.validated_data)
+        profile_fields = profiles.assign(profile, values)
+        if not profile.full_name:
+            profile_fields += profiles.assign(profile, {"full_name": user.full_name})
+        if profile_fields:
+            profile.save(update_fields=profile_fields)
+
+        if skills is not None:
+            profiles.sync_links(user_model.ProfileSkills, profile, "skill_id", skills)
+        if interests is not None:
+            profiles.sync_links(
+                user_model.ProfileCauses, profile, "cause_id", interests
+            )
 
 
 #
-class SkillViewAPI(generics.ListAPIView):
+class SkillViewAPI(ReplicaReadMixin, WarmCacheMixin, generics.ListAPIView):
+    cache_group = "skills"
     queryset = user_model.SkillsModel.objects.all()
     serializer_class = user_serializer.SkillModelSerializer
     permission_classes = [AllowAny]
 
 
-class InterestsViewAPI(generics.ListAPIView):
+class InterestsViewAPI(ReplicaReadMixin, WarmCacheMixin, generics.ListAPIView):
+    cache_group = "interests"
     queryset = user_model.CausesChoicesModel.objects.all()
     serializer_class = user_serializer.CausesChoicesModelSerializer
     permission_classes = [AllowAny]
+
+
+# Async (ASGI) read-only endpoints: /async/...
+class AsyncUserList(AsyncListView):
+    serializer_class = user_serializer.UserSerializer
+    serialize_in_thread = True
+
+    def get_queryset(self):
+        return user_model.User.objects.filter(user_id=self.kwargs["user_id"])
+
+
+class AsyncSkillList(AsyncListView):
+    serializer_class = user_serializer.SkillModelSerializer
+
+    def get_queryset(self):
+        return user_model.SkillsModel.objects.all()
+
+
+class AsyncInterestList(AsyncListView):
+    serializer_class = user_serializer.CausesChoicesModelSerializer
+
+    def get_queryset(self):
+        return user_model.CausesChoicesModel.objects.all()
@@ -0,0 +1,6 @@
+from api.warmup import cache_group
+
+from .models import CausesChoicesModel, SkillsModel
+
+cache_group("skills", [("skillsView", {})], models=[SkillsModel])
+cache_group("interests", [("interestsView", {})], models=[CausesChoicesModel])
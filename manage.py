@@ -4,17 +4,12 @@
 import os
 import sys
 
-from _backend.settings import base
-
 
 def main():
     """Run administrative tasks."""
-    if base.DEBUG:
-        # run locally
-        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "_backend.settings.local")
-    else:
-        # run in production
-        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "_backend.settings.production")
+    # local by default; production commands set
+    # DJANGO_SETTINGS_MODULE=_backend.settings.production
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "_backend.settings.local")
 
     try:
         from django.core.management import execute_from_command_line